@@ -1,11 +1,27 @@
 # analyzer/background_task.py
 import os
 import time
-import json
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import orjson
 import pandas as pd
 
+from .file_utils import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def _load_task_file(path):
+    """Charge un fichier de tâche JSON, ou None s'il est illisible ou invalide"""
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
 class BackgroundTask:
     """
     Gestion des tâches d'analyse en arrière-plan qui continuent même si l'utilisateur change d'onglet
@@ -13,6 +29,20 @@ class BackgroundTask:
     
     TASKS_DIR = Path("saved_analyses/tasks")
     
+    # Stockage des analyses partagé par toutes les tâches (créé à la première sauvegarde)
+    _storage_instance = None
+    _storage_lock = threading.Lock()
+    
+    @classmethod
+    def _storage(cls):
+        """Retourne l'instance partagée d'AnalysisStorage, créée une seule fois"""
+        if cls._storage_instance is None:
+            with cls._storage_lock:
+                if cls._storage_instance is None:
+                    from analyzer.storage import AnalysisStorage
+                    cls._storage_instance = AnalysisStorage()
+        return cls._storage_instance
+    
     @classmethod
     def ensure_dir_exists(cls):
         """S'assure que le répertoire des tâches existe"""
@@ -34,8 +64,10 @@ class BackgroundTask:
         # S'assurer que le répertoire existe
         cls.ensure_dir_exists()
         
-        # Générer un ID de tâche basé sur l'horodatage
-        task_id = f"{int(time.time())}"
+        # Générer un ID de tâche basé sur l'horodatage en nanosecondes (pas de collision
+        # entre deux tâches créées dans la même seconde)
+        created_at_ns = time.time_ns()
+        task_id = f"{created_at_ns:x}"
         task_path = cls.TASKS_DIR / f"{task_id}.json"
         
         # Préparer les données de la tâche
@@ -46,21 +78,22 @@ class BackgroundTask:
             "status": "created",
             "progress": 0,
             "results": None,
-            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),  # Pour l'affichage
+            "created_at_ns": created_at_ns,  # Pour le tri
+            "updated_at": None,  # Renseigné à chaque sauvegarde
             "message": "Tâche créée, en attente de traitement"
         }
         
         # Enregistrer la tâche dans un fichier JSON
         try:
-            with open(task_path, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, indent=2)
+            cls._save_task_data(task_id, task_data)
                 
-            # Log pour déboguer
-            print(f"Tâche créée avec l'ID {task_id} dans {task_path}")
+            # Log pour déboguer (niveau DEBUG)
+            logger.debug("Tâche créée avec l'ID %s dans %s", task_id, task_path)
                 
             # Lancer le thread qui exécutera la tâche
-            thread = threading.Thread(target=cls._run_task, args=(task_id,))
+            # (les données sont transmises directement, sans relire le fichier JSON)
+            thread = threading.Thread(target=cls._run_task, args=(task_id, task_data))
             thread.daemon = True  # Le thread s'arrêtera quand le programme principal s'arrête
             thread.start()
             
@@ -80,25 +113,27 @@ class BackgroundTask:
             return task_id
     
     @classmethod
-    def _run_task(cls, task_id):
+    def _run_task(cls, task_id, task_data=None):
         """
         Exécute une tâche en arrière-plan
         
         Args:
             task_id (str): ID de la tâche à exécuter
+            task_data (dict, optional): Données de la tâche déjà en mémoire ; à défaut,
+                elles sont chargées depuis le fichier de la tâche
         """
-        task_path = cls.TASKS_DIR / f"{task_id}.json"
-        
-        if not task_path.exists():
-            return
+        if task_data is None:
+            task_path = cls.TASKS_DIR / f"{task_id}.json"
             
-        # Charger les détails de la tâche
-        with open(task_path, 'r', encoding='utf-8') as f:
-            task_data = json.load(f)
+            if not task_path.exists():
+                return
+                
+            # Charger les détails de la tâche
+            with open(task_path, 'rb') as f:
+                task_data = orjson.loads(f.read())
             
         # Mettre à jour le statut
         task_data["status"] = "running"
-        task_data["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
         task_data["message"] = "Analyse en cours..."
         cls._save_task_data(task_id, task_data)
         
@@ -115,13 +150,11 @@ class BackgroundTask:
             task_data["status"] = "completed"
             task_data["progress"] = 100
             task_data["results"] = result
-            task_data["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
             task_data["message"] = "Analyse terminée avec succès"
             
         except Exception as e:
             # En cas d'erreur
             task_data["status"] = "error"
-            task_data["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
             task_data["message"] = f"Erreur: {str(e)}"
             
         # Sauvegarder les mises à jour
@@ -129,16 +162,20 @@ class BackgroundTask:
     
     @classmethod
     def _save_task_data(cls, task_id, task_data):
-        """Sauvegarde les données d'une tâche"""
+        """
+        Sauvegarde les données d'une tâche et met à jour sa date de modification.
+        
+        L'écriture passe par un fichier temporaire remplacé atomiquement, de sorte
+        que les lecteurs ne voient jamais un fichier JSON à moitié écrit.
+        """
+        task_data["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
         task_path = cls.TASKS_DIR / f"{task_id}.json"
-        with open(task_path, 'w', encoding='utf-8') as f:
-            json.dump(task_data, f, indent=2)
+        atomic_write_bytes(task_path, orjson.dumps(task_data, option=orjson.OPT_INDENT_2))
     
     @classmethod
     def _analyze_directory(cls, task_id, task_data):
         """Analyse un répertoire en arrière-plan"""
-        from analyzer.core import analyze_file, is_supported_file, calculate_risk_scores
-        from analyzer.storage import AnalysisStorage
+        from analyzer.core import calculate_risk_scores, iter_supported_files, scan_files
         
         params = task_data["params"]
         directory_path = params.get("directory_path")
@@ -146,86 +183,78 @@ class BackgroundTask:
         save_analysis = params.get("save_analysis", True)
         excluded_extensions = params.get("excluded_extensions", [])
         
-        # Trouver tous les fichiers à analyser
-        all_files = []
-        for root, _, files in os.walk(directory_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if is_supported_file(file_path):
-                    # Vérifier si l'extension est exclue
-                    if Path(file_path).suffix.lower() not in excluded_extensions:
-                        all_files.append(file_path)
-        
-        # Limiter le nombre de fichiers si nécessaire
-        if max_files and max_files > 0 and len(all_files) > max_files:
-            all_files = all_files[:max_files]
-            
-        total_files = len(all_files)
+        def iter_candidates():
+            """Fichiers à analyser (supportés, extension non exclue, hors fichiers temporaires)"""
+            return iter_supported_files(directory_path, excluded_extensions, max_files)
+        
+        # Pré-comptage rapide (scandir seul) pour le dénominateur de la progression :
+        # les chemins ne sont pas conservés, la découverte est ensuite refaite en flux
+        total_files = sum(1 for _ in iter_candidates())
+        processed = 0
         results = []
         skipped_files = []
         error_files = []
         
-        for i, file_path in enumerate(all_files):
-            try:
-                result = analyze_file(file_path)
-                if result:
-                    results.append(result)
-                else:
-                    # Si le résultat est None, c'est probablement un fichier temporaire ou inaccessible
-                    if Path(file_path).name.startswith("~$"):
-                        skipped_files.append({"path": file_path, "reason": "Fichier temporaire"})
-                    else:
-                        error_files.append({"path": file_path, "reason": "Analyse impossible"})
-            except Exception as e:
-                error_files.append({"path": file_path, "reason": str(e)[:50] + "..."})
+        # Persister la progression au plus toutes les 0,5 s (et seulement si elle a changé)
+        last_save_ts = time.monotonic()
+        last_save_pct = task_data["progress"]
+        
+        max_workers = max(1, min(os.cpu_count() or 1, total_files))
+        # Les fichiers sont envoyés par lots pour amortir les échanges entre processus ;
+        # on garde au moins 4 lots par processus pour équilibrer la charge, et des lots
+        # de taille bornée pour que la progression reste fluide
+        chunksize = max(1, min(32, total_files // (max_workers * 4)))
+        for file_path, result, error in scan_files(iter_candidates(), max_workers=max_workers,
+                                                   chunksize=chunksize):
+            if result:
+                results.append(result)
+            elif error:
+                error_files.append({"path": file_path, "reason": error})
+            # Si le résultat est None, c'est probablement un fichier temporaire ou inaccessible
+            elif os.path.basename(file_path).startswith("~$"):
+                skipped_files.append({"path": file_path, "reason": "Fichier temporaire"})
+            else:
+                error_files.append({"path": file_path, "reason": "Analyse impossible"})
+            processed += 1
             
-            # Mettre à jour la progression
-            progress = int((i + 1) / total_files * 100)
-            task_data["progress"] = progress
-            task_data["message"] = f"Analyse en cours... {i+1}/{total_files} fichiers traités"
-            cls._save_task_data(task_id, task_data)
+            # Mettre à jour la progression (l'arborescence peut avoir changé depuis le pré-comptage)
+            total_files = max(total_files, processed)
+            progress = int(processed / total_files * 100)
+            now = time.monotonic()
+            if progress != last_save_pct and now - last_save_ts > 0.5:
+                task_data["progress"] = progress
+                task_data["message"] = f"Analyse en cours... {processed}/{total_files} fichiers traités"
+                cls._save_task_data(task_id, task_data)
+                last_save_ts = now
+                last_save_pct = progress
         
         if not results:
             return {"error": "Aucun résultat d'analyse obtenu."}
         
-        results_df = pd.DataFrame(results)
+        # Calculer les scores de risque directement sur la liste de résultats
+        task_result = {
+            "results": results,
+            "skipped_files": skipped_files,
+            "error_files": error_files,
+            "risk_analysis": calculate_risk_scores(results)
+        }
         
-        # Sauvegarder l'analyse si demandé
+        # Sauvegarder l'analyse si demandé (seul le stockage a besoin d'un DataFrame)
         if save_analysis:
-            storage = AnalysisStorage()
             analysis_name = f"Analyse de {os.path.basename(directory_path)}"
-            analysis_id = storage.save_analysis(
-                results_df, 
+            task_result["analysis_id"] = cls._storage().save_analysis(
+                pd.DataFrame(results), 
                 name=analysis_name,
                 source_path=directory_path,
-                description=f"Analyse automatique de {len(results)} fichiers ({total_files - len(results)} ignorés/en erreur)"
+                description=f"Analyse automatique de {len(results)} fichiers ({processed - len(results)} ignorés/en erreur)"
             )
-            
-            # Calculer les scores de risque
-            risk_analysis = calculate_risk_scores(results_df.to_dict('records'))
-            
-            return {
-                "analysis_id": analysis_id,
-                "results": results_df.to_dict('records'),
-                "skipped_files": skipped_files,
-                "error_files": error_files,
-                "risk_analysis": risk_analysis
-            }
-        else:
-            risk_analysis = calculate_risk_scores(results_df.to_dict('records'))
-            return {
-                "results": results_df.to_dict('records'),
-                "skipped_files": skipped_files,
-                "error_files": error_files,
-                "risk_analysis": risk_analysis
-            }
+        
+        return task_result
     
     @classmethod
     def _analyze_files(cls, task_id, task_data):
         """Analyse des fichiers téléchargés en arrière-plan"""
-        from analyzer.core import analyze_file, calculate_risk_scores
-        from analyzer.storage import AnalysisStorage
-        import tempfile
+        from analyzer.core import analyze_bytes, calculate_risk_scores
         
         params = task_data["params"]
         file_paths = params.get("file_paths", [])
@@ -239,62 +268,52 @@ class BackgroundTask:
         total_files = len(file_paths)
         results = []
         
+        # Persister la progression au plus toutes les 0,5 s (et seulement si elle a changé)
+        last_save_ts = time.monotonic()
+        last_save_pct = task_data["progress"]
+        
         for i, (file_path, file_name, file_content) in enumerate(zip(file_paths, file_names, file_contents)):
             try:
-                # Écrire le contenu dans un fichier temporaire
-                with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_name).suffix) as tmp_file:
-                    tmp_file.write(file_content.encode('utf-8'))
-                    temp_path = tmp_file.name
-                
-                # Analyser le fichier
-                result = analyze_file(temp_path)
+                # Analyser le contenu directement en mémoire, sans fichier temporaire
+                content = file_content.encode('utf-8') if isinstance(file_content, str) else file_content
+                result = analyze_bytes(file_name, content)
                 if result:
-                    result["file_path"] = file_name  # Utiliser le nom original plutôt que le chemin temporaire
                     results.append(result)
-                
-                # Supprimer le fichier temporaire
-                os.unlink(temp_path)
             except Exception as e:
                 continue
             
             # Mettre à jour la progression
             progress = int((i + 1) / total_files * 100)
-            task_data["progress"] = progress
-            task_data["message"] = f"Analyse en cours... {i+1}/{total_files} fichiers traités"
-            cls._save_task_data(task_id, task_data)
+            now = time.monotonic()
+            if progress != last_save_pct and now - last_save_ts > 0.5:
+                task_data["progress"] = progress
+                task_data["message"] = f"Analyse en cours... {i+1}/{total_files} fichiers traités"
+                cls._save_task_data(task_id, task_data)
+                last_save_ts = now
+                last_save_pct = progress
         
         if not results:
             return {"error": "Aucun résultat d'analyse obtenu pour les fichiers chargés."}
         
-        results_df = pd.DataFrame(results)
+        # Calculer les scores de risque directement sur la liste de résultats
+        task_result = {
+            "results": results,
+            "risk_analysis": calculate_risk_scores(results)
+        }
         
-        # Sauvegarder l'analyse si demandé
+        # Sauvegarder l'analyse si demandé (seul le stockage a besoin d'un DataFrame)
         if save_analysis:
-            storage = AnalysisStorage()
             file_names_display = ", ".join([name for name in file_names[:3]])
             if len(file_names) > 3:
                 file_names_display += f" et {len(file_names) - 3} autres"
             analysis_name = f"Analyse de fichiers: {file_names_display}"
-            analysis_id = storage.save_analysis(
-                results_df, 
+            task_result["analysis_id"] = cls._storage().save_analysis(
+                pd.DataFrame(results), 
                 name=analysis_name,
                 description=f"Analyse de {len(file_names)} fichiers téléchargés"
             )
-            
-            # Calculer les scores de risque
-            risk_analysis = calculate_risk_scores(results_df.to_dict('records'))
-            
-            return {
-                "analysis_id": analysis_id,
-                "results": results_df.to_dict('records'),
-                "risk_analysis": risk_analysis
-            }
-        else:
-            risk_analysis = calculate_risk_scores(results_df.to_dict('records'))
-            return {
-                "results": results_df.to_dict('records'),
-                "risk_analysis": risk_analysis
-            }
+        
+        return task_result
     
     @classmethod
     def get_task_status(cls, task_id):
@@ -314,11 +333,7 @@ class BackgroundTask:
         if not task_path.exists():
             return None
             
-        try:
-            with open(task_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return None
+        return _load_task_file(task_path)
     
     @classmethod
     def get_all_tasks(cls):
@@ -333,27 +348,26 @@ class BackgroundTask:
         tasks = []
         # Vérifier que le répertoire existe
         if not cls.TASKS_DIR.exists():
-            print(f"Répertoire des tâches {cls.TASKS_DIR} n'existe pas!")
+            logger.debug("Répertoire des tâches %s n'existe pas!", cls.TASKS_DIR)
             return []
         
-        # Lister les fichiers de tâches disponibles
-        task_files = list(cls.TASKS_DIR.glob("*.json"))
-        print(f"Fichiers de tâches trouvés: {len(task_files)}")
-        
-        for file in task_files:
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    task_data = json.load(f)
-                    tasks.append(task_data)
-                    print(f"Tâche chargée: {file.name} - statut: {task_data.get('status', 'inconnu')}")
-            except Exception as e:
-                print(f"Erreur lors du chargement de la tâche {file}: {str(e)}")
-                continue
+        # Lister les fichiers de tâches disponibles (les fichiers vides sont en cours de création)
+        with os.scandir(cls.TASKS_DIR) as entries:
+            task_files = [entry.path for entry in entries
+                          if entry.name.endswith(".json") and entry.stat().st_size > 0]
+        logger.debug("Fichiers de tâches trouvés: %d", len(task_files))
+        
+        # Lecture et décodage en parallèle : les E/S et orjson libèrent le GIL
+        if task_files:
+            with ThreadPoolExecutor(max_workers=min(8, len(task_files))) as executor:
+                tasks = [task_data for task_data in executor.map(_load_task_file, task_files)
+                         if task_data is not None]
                 
-        # Trier par date de création, plus récent en premier
-        tasks.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Trier par date de création, plus récent en premier (les tâches antérieures à
+        # created_at_ns sont classées après, entre elles par leur date formatée)
+        tasks.sort(key=lambda x: (x.get("created_at_ns", 0), x.get("created_at", "")), reverse=True)
         
-        print(f"Total des tâches chargées: {len(tasks)}")
+        logger.debug("Total des tâches chargées: %d", len(tasks))
         return tasks
     
     @classmethod
@@ -369,10 +383,13 @@ class BackgroundTask:
         current_time = time.time()
         max_age = days * 24 * 60 * 60  # Convertir en secondes
         
-        for file in cls.TASKS_DIR.glob("*.json"):
-            file_time = os.path.getctime(file)
-            if current_time - file_time > max_age:
+        # os.scandir fournit un stat mis en cache par DirEntry : un seul appel système par tâche
+        with os.scandir(cls.TASKS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
                 try:
-                    os.remove(file)
-                except:
+                    if current_time - entry.stat().st_ctime > max_age:
+                        os.remove(entry.path)
+                except OSError:
                     continue
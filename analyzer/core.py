@@ -1,6 +1,19 @@
 # analyzer/core.py
 import re
+import io
+import functools
+import hashlib
+import queue
+import threading
+import itertools
+import multiprocessing
+import csv
+import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 import spacy
+import numpy as np
 import pandas as pd
 import os
 from typing import List, Dict, Any, Tuple
@@ -8,15 +21,40 @@ import docx
 from PyPDF2 import PdfReader
 import logging
 from pathlib import Path
+from .term_matcher import TermMatcher
 from .validators import (
     validate_email, validate_phone, validate_date, 
     validate_secu, validate_siret, validate_person_name,
-    validate_postal_address, validate_ip_address
+    validate_postal_address, validate_ip_address, analyze_name_context
 )
 
+logger = logging.getLogger(__name__)
+
 # Chargement du modèle spaCy (sera initialisé au premier appel)
 nlp = None
 
+SPACY_MODEL = "fr_core_news_md"
+
+# Composants du pipeline inutiles pour la reconnaissance d'entités (NER)
+SPACY_DISABLED_COMPONENTS = ["tagger", "morphologizer", "parser", "lemmatizer", "attribute_ruler"]
+
+# Taille maximale du texte transmis à spaCy (limite par défaut de nlp.max_length) ;
+# le texte est découpé en morceaux de NER_CHUNK_SIZE caractères pour borner la mémoire
+NER_MAX_LENGTH = 1000000
+NER_CHUNK_SIZE = 50000
+
+# Nombre de documents traités ensemble par nlp.pipe
+NER_BATCH_SIZE = 64
+
+# Cache des entités PER par empreinte du texte : les documents identiques (modèles,
+# pièces jointes répétées) ne repassent pas par spaCy
+NER_CACHE_SIZE = 1024
+_ner_cache = OrderedDict()
+_ner_cache_lock = threading.Lock()
+
+# Nombre de fichiers envoyés ensemble à un processus de travail par scan_files
+SCAN_CHUNKSIZE = 16
+
 # Listes d'exclusion importées du module de configuration
 from config.exclusion_lists import (
     EXCLUDED_PERSONS, PROFESSIONAL_CONTEXT, 
@@ -31,34 +69,145 @@ PHONE_REGEX = re.compile(
     r'\b(?:(?:(?:\+|00)33[ .-]?(?:\(0\)[ .-]?)?)|0)[1-9](?:[ .-]?\d{2}){4}\b'
 )
 DATE_REGEX = re.compile(
-    r'\b(?:0[1-9]|[12]\d|3[01])[-/.](0[1-9]|1[012])[-/.](19|20)\d{2}\b'
+    r'\b(?:0[1-9]|[12]\d|3[01])[-/.](?:0[1-9]|1[012])[-/.](?:19|20)\d{2}\b'
 )
 SECU_REGEX = re.compile(
     r'\b[123]\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01]|[2468][02468]|[13579][13579])\d{6}(?:\d{2})?\b'
 )
 SIRET_REGEX = re.compile(r'\b\d{14}\b')
 
+# Format de téléphone très courant (« 01 23 45 67 89 »), dont la confiance est réduite
+COMMON_PHONE_FORMAT_REGEX = re.compile(r'^0[1-9](?: \d{2}){4}$')
+
 # ===========================
 # Expressions régulières améliorées pour adresses postales et IP
 # ===========================
+# Adresse postale : numéro, voie, code postal et ville facultative. Équivalent de
+#   \b\d{1,4}[,\s]+[libellé\s]+[,\s]+\d{5}(?:\s+[libellé\s]+)?\b
+# réécrit sans quantificateurs voisins acceptant tous deux les blancs : la forme directe
+# essayait tous les découpages d'une longue suite d'espaces (coût cubique en sa longueur)
 POSTAL_ADDRESS_REGEX = re.compile(
-    r'\b\d{1,4}[,\s]+(?:[a-zA-ZÀ-ÿ\'\-\.\s]+)[,\s]+\d{5}(?:\s+[a-zA-ZÀ-ÿ\'\-\.\s]+)?\b'
+    r'\b\d{1,4}'
+    # Séparateurs, voie (du premier au dernier caractère de libellé, sans virgule), séparateurs
+    r'(?:[,\s]+[a-zA-ZÀ-ÿ\'\-\.](?:[a-zA-ZÀ-ÿ\'\-\.\s]*[a-zA-ZÀ-ÿ\'\-\.])?[,\s]+'
+    # ... ou séparateurs seuls, dont un blanc qui n'est ni le premier ni le dernier
+    r'|[,\s],*\s[,\s]*[,\s])'
+    r'\d{5}(?:\s[a-zA-ZÀ-ÿ\'\-\.\s]+)?\b'
 )
+# Ancre nécessaire à toute adresse postale : un code à 5 chiffres précédé d'une virgule ou
+# d'un blanc et non suivi d'un caractère de mot. Sa recherche (motif court sans retour
+# arrière) évite le parcours coûteux de POSTAL_ADDRESS_REGEX sur les textes sans code postal
+POSTAL_CODE_ANCHOR_RE = re.compile(r'[,\s]\d{5}(?!\w)')
 IP_ADDRESS_REGEX = re.compile(
     r'\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b'
 )
 
+# Alternance nommée des motifs ci-dessus : un seul parcours du texte au lieu d'un par type.
+# Le type trouvé est donné par match.lastgroup (les motifs n'ont pas d'autres groupes capturants).
+# L'ordre départage deux motifs commençant au même endroit : un téléphone « 01.23.45.67.89 »
+# n'est plus aussi compté comme l'IP « 01.23.45.67 ».
+# Les adresses postales restent un parcours à part : leur fin de motif (libellé de ville en
+# texte libre) absorberait le début d'un email ou d'un téléphone qui suit.
+PERSONAL_DATA_REGEX = re.compile("|".join(
+    f"(?P<{name}>{regex.pattern})"
+    for name, regex in (
+        ("email", EMAIL_REGEX),
+        ("phone", PHONE_REGEX),
+        ("ip", IP_ADDRESS_REGEX),
+        ("date", DATE_REGEX),
+        ("secu", SECU_REGEX),
+        ("siret", SIRET_REGEX),
+    )
+))
+
+# Préfiltre Hyperscan optionnel (pip install hyperscan, non disponible sous Windows) :
+# un passage SIMD indique quels motifs peuvent apparaître dans le texte, ce qui évite
+# les parcours `re` sur les documents sans aucun candidat
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+PREFILTER_PATTERNS = (
+    ("email", EMAIL_REGEX),
+    ("phone", PHONE_REGEX),
+    ("ip", IP_ADDRESS_REGEX),
+    ("date", DATE_REGEX),
+    ("secu", SECU_REGEX),
+    ("siret", SIRET_REGEX),
+    ("postal", POSTAL_ADDRESS_REGEX),
+)
+
+@functools.lru_cache(maxsize=1)
+def get_hyperscan_prefilter():
+    """
+    Compile la base Hyperscan du préfiltre (une seule fois par processus).
+    
+    Returns:
+        hyperscan.Database ou None si Hyperscan n'est pas disponible
+    """
+    if hyperscan is None:
+        return None
+    try:
+        # PREFILTER : correspondance approchée sans faux négatif ; SINGLEMATCH : un seul
+        # signalement par motif suffit
+        flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=[regex.pattern.encode("utf-8") for _, regex in PREFILTER_PATTERNS],
+            ids=list(range(len(PREFILTER_PATTERNS))),
+            elements=len(PREFILTER_PATTERNS),
+            flags=[flags] * len(PREFILTER_PATTERNS),
+        )
+        return database
+    except Exception as e:
+        logger.warning("Préfiltre Hyperscan indisponible, utilisation de re seul: %s", e)
+        return None
+
+def prefilter_data_types(text: str):
+    """
+    Indique les types de données pouvant apparaître dans le texte (sur-ensemble garanti).
+    
+    Returns:
+        set: Noms des motifs candidats (voir PREFILTER_PATTERNS), ou None si le préfiltre
+        n'est pas utilisable et que tous les motifs doivent être recherchés
+    """
+    database = get_hyperscan_prefilter()
+    if database is None:
+        return None
+    
+    candidates = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        candidates.add(PREFILTER_PATTERNS[pattern_id][0])
+    
+    try:
+        database.scan(text.encode("utf-8"), match_event_handler=on_match)
+    except Exception:
+        # Texte non encodable (surrogates isolés) ou erreur de scan : pas de préfiltrage
+        return None
+    return candidates
+
+@functools.lru_cache(maxsize=1)
+def get_nlp():
+    """
+    Charge une seule fois par processus le modèle spaCy, limité aux composants utiles à la NER,
+    et y ajoute les patterns personnalisés.
+    """
+    try:
+        model = spacy.load(SPACY_MODEL, disable=SPACY_DISABLED_COMPONENTS)
+    except OSError:
+        logger.error("Modèle spaCy %s non trouvé. Installation nécessaire.", SPACY_MODEL)
+        raise Exception(f"Modèle spaCy non trouvé. Exécutez : python -m spacy download {SPACY_MODEL}")
+    add_custom_patterns(model)
+    # Attendu : tok2vec, entity_ruler (inséré avant ner), ner
+    logger.info("Pipeline spaCy actif: %s", model.pipe_names)
+    return model
+
 def initialize_nlp():
     """Initialise le modèle NLP et les patterns personnalisés."""
     global nlp
-    if nlp is None:
-        try:
-            SPACY_MODEL = "fr_core_news_md"
-            nlp = spacy.load(SPACY_MODEL)
-            add_custom_patterns(nlp)
-        except OSError:
-            logging.error(f"Modèle spaCy {SPACY_MODEL} non trouvé. Installation nécessaire.")
-            raise Exception(f"Modèle spaCy non trouvé. Exécutez : python -m spacy download {SPACY_MODEL}")
+    nlp = get_nlp()
     return nlp
 
 def add_custom_patterns(nlp):
@@ -96,22 +245,60 @@ def add_custom_patterns(nlp):
         patterns.extend(template_patterns)
         
         ruler.add_patterns(patterns)
-        logging.info(f"Ajout de {len(patterns)} patterns pour exclure des entités spécifiques")
+        logger.info("Ajout de %s patterns pour exclure des entités spécifiques", len(patterns))
         return True
     except Exception as e:
-        logging.error(f"Erreur lors de l'ajout de patterns personnalisés: {str(e)}")
+        logger.error("Erreur lors de l'ajout de patterns personnalisés: %s", e)
         return False
 
-def is_likely_organizational_name(text: str, entity: str) -> bool:
+# Indicateurs de contexte professionnel autour d'une entité, regroupés en une seule alternance
+ORG_CONTEXT_INDICATORS = [
+    "directeur", "directrice", "responsable", "chef", "technicien", "informatique",
+    "référent", "chargé de", "service", "département", "pôle", "l'équipe",
+    "signature", "contact", "coordonnées", "adjoint", "administratif",
+    "conseiller", "manager", "gestion", "gestionnaire", "assistant"
+]
+ORG_INDICATOR_RE = re.compile("|".join(map(re.escape, ORG_CONTEXT_INDICATORS)))
+
+# Mots qui, juste après une entité, indiquent un rôle organisationnel
+ORG_ROLE_AFTER_RE = re.compile(r"\s*(?:est|a été nommé|occupe|en charge|:)")
+
+# Unités organisationnelles et indicateurs recherchés dans le nom lui-même
+ORGANIZATION_UNITS_LOWER = tuple(unit.lower() for unit in ORGANIZATION_UNITS)
+ORG_NAME_INDICATORS = ("service", "département", "direction", "pôle", "équipe", "groupe", "unité")
+
+# Indicateurs de modèle/template, recherchés en un seul parcours du document
+TEMPLATE_MATCHER = TermMatcher(TEMPLATE_INDICATORS)
+
+# Noms signalés comme faux positifs potentiels (unités ou fonctions de l'organisation)
+FALSE_POSITIVE_NAME_MATCHER = TermMatcher((
+    *ORGANIZATION_UNITS_LOWER,
+    "service", "département", "direction", "unité", "pôle", "responsable", "chef"
+))
+
+# Formules officielles autour d'un nom ({entity} : nom échappé, en minuscules)
+OFFICIAL_PATTERN_TEMPLATE = (
+    r"(?:m\. |mr |mme |monsieur |madame ){entity}"
+    r"|{entity}(?:, directeur|, responsable| \(directeur| \(responsable| - directeur| - responsable)"
+)
+
+@functools.lru_cache(maxsize=4096)
+def _official_regex(entity_lower: str):
+    """Formules officielles compilées pour une entité (les mêmes noms reviennent d'un document à l'autre)."""
+    return re.compile(OFFICIAL_PATTERN_TEMPLATE.format(entity=re.escape(entity_lower)))
+
+def is_likely_organizational_name(text: str, entity: str, text_lower: str = None) -> bool:
     """
     Détermine si un nom est probablement lié à l'organisation plutôt qu'à une personne externe.
     Analyse détaillée du contexte pour réduire les faux positifs.
+    text_lower (text en minuscules) est calculé s'il n'est pas fourni.
     """
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
     entity_lower = entity.lower()
     
     # Vérifier si l'entité contient une unité organisationnelle connue
-    if any(unit.lower() in entity_lower for unit in ORGANIZATION_UNITS):
+    if any(unit in entity_lower for unit in ORGANIZATION_UNITS_LOWER):
         return True
     
     # Vérifier si l'entité est complètement en majuscules (acronyme)
@@ -119,116 +306,67 @@ def is_likely_organizational_name(text: str, entity: str) -> bool:
         return True
     
     # Vérifier les indicateurs d'organisation dans le nom lui-même
-    org_name_indicators = ["service", "département", "direction", "pôle", "équipe", "groupe", "unité"]
-    if any(indicator in entity_lower for indicator in org_name_indicators):
+    if any(indicator in entity_lower for indicator in ORG_NAME_INDICATORS):
         return True
         
-    # Indicateurs de contexte professionnel autour de l'entité
-    org_indicators = [
-        "directeur", "directrice", "responsable", "chef", "technicien", "informatique",
-        "référent", "chargé de", "service", "département", "pôle", "l'équipe",
-        "signature", "contact", "coordonnées", "adjoint", "administratif",
-        "conseiller", "manager", "gestion", "gestionnaire", "assistant"
+    # Analyse du contexte proximal (occurrences éventuellement chevauchantes, d'où le lookahead).
+    # Les fenêtres sont gardées sous forme de bornes : les recherches se font avec pos/endpos
+    # directement dans text_lower, sans copier chaque contexte
+    text_length = len(text)
+    entity_length = len(entity)
+    windows = [
+        (max(0, match.start() - 50), min(text_length, match.start() + entity_length + 50))
+        for match in re.finditer(f"(?={re.escape(entity_lower)})", text_lower)
     ]
     
-    # Analyse du contexte proximal
-    occurrences = []
-    start_idx = 0
-    while True:
-        idx = text_lower.find(entity_lower, start_idx)
-        if idx == -1:
-            break
-        window_start = max(0, idx - 50)  # Fenêtre plus large
-        window_end = min(len(text), idx + len(entity) + 50)
-        context = text[window_start:window_end].lower()
-        occurrences.append(context)
-        start_idx = idx + 1
-    
     # Si aucune occurrence, retourner False
-    if not occurrences:
+    if not windows:
         return False
     
-    # Compter les contextes organisationnels
-    org_contexts = sum(1 for context in occurrences if any(indicator in context for indicator in org_indicators))
-    
-    # Si plus de la moitié des occurrences sont dans un contexte organisationnel
-    if org_contexts >= len(occurrences) / 2:
-        return True
+    # Compter les contextes organisationnels, en s'arrêtant dès que la moitié des
+    # occurrences sont dans un contexte organisationnel
+    org_contexts = 0
+    for window_start, window_end in windows:
+        if ORG_INDICATOR_RE.search(text_lower, window_start, window_end):
+            org_contexts += 1
+            if org_contexts >= len(windows) / 2:
+                return True
     
     # Nouveaux patterns spécifiques aux formules officielles
-    official_patterns = [
-        f"m. {entity_lower}", f"mr {entity_lower}", f"mme {entity_lower}",
-        f"monsieur {entity_lower}", f"madame {entity_lower}",
-        f"{entity_lower}, directeur", f"{entity_lower}, responsable",
-        f"{entity_lower} (directeur", f"{entity_lower} (responsable",
-        f"{entity_lower} - directeur", f"{entity_lower} - responsable"
-    ]
-    
-    if any(pattern in text_lower for pattern in official_patterns):
+    if _official_regex(entity_lower).search(text_lower) is not None:
         return True
     
     # Vérifier les mots après l'entité qui indiquent un rôle organisationnel
-    for occurrence in occurrences:
-        entity_pos = occurrence.find(entity_lower)
-        if entity_pos != -1:
-            after_entity = occurrence[entity_pos + len(entity_lower):].strip()
-            if after_entity.startswith(("est", "a été nommé", "occupe", "en charge", ":")):
-                return True
+    for window_start, window_end in windows:
+        entity_pos = text_lower.find(entity_lower, window_start, window_end)
+        if entity_pos != -1 and ORG_ROLE_AFTER_RE.match(text_lower, entity_pos + len(entity_lower), window_end):
+            return True
     
     return False
 
-def analyze_name_context(name: str, text: str) -> float:
-    """
-    Analyse le contexte autour d'un nom pour déterminer s'il s'agit d'un contexte professionnel.
-    
-    Returns:
-        float: Score de contexte professionnel (plus élevé = plus professionnel)
-    """
-    context_score = 0.0
-    
-    try:
-        name_pos = text.lower().find(name.lower())
-        if name_pos == -1:
-            return 0.0
-            
-        start = max(0, name_pos - 100)
-        end = min(len(text), name_pos + len(name) + 100)
-        context = text[start:end].lower()
-        
-        for term in PROFESSIONAL_CONTEXT:
-            if term in context:
-                context_score += 0.15
-        
-        titles = ["m.", "mme.", "mr.", "dr.", "monsieur", "madame", "docteur", "prof.", "professeur"]
-        for title in titles:
-            if title in context:
-                context_score += 0.1
-        
-        for indicator in TEMPLATE_INDICATORS:
-            if indicator in context:
-                context_score += 0.2
-    except:
-        pass
-    
-    return min(1.0, context_score)
+# Extensions de fichiers supportées pour l'analyse
+SUPPORTED_SUFFIXES = frozenset({
+    '.txt', '.log', '.csv', '.docx', '.doc', '.xlsx', '.xls', '.pdf', '.rtf', '.odt', '.ods'
+})
 
 def is_supported_file(file_path: str) -> bool:
     """Vérifie si le fichier est d'un type supporté pour l'analyse."""
     from .file_utils import is_temp_file
     
-    # Ignorer les fichiers temporaires
-    if is_temp_file(file_path):
+    # Vérifier l'extension du fichier (test le moins coûteux en premier)
+    if os.path.splitext(file_path)[1].lower() not in SUPPORTED_SUFFIXES:
         return False
     
-    # Vérifier l'extension du fichier
-    extension = Path(file_path).suffix.lower()
-    return extension in ['.txt', '.log', '.csv', '.docx', '.doc', '.xlsx', '.xls', '.pdf', '.rtf', '.odt', '.ods']
+    # Ignorer les fichiers temporaires
+    return not is_temp_file(file_path)
 
 def get_file_type(file_path: str) -> str:
     """Détermine le type de fichier."""
     extension = Path(file_path).suffix.lower()
-    if extension in ['.txt', '.log', '.csv']:
+    if extension in ['.txt', '.log']:
         return 'text'
+    elif extension == '.csv':
+        return 'csv'
     elif extension in ['.docx', '.doc']:
         return 'word'
     elif extension in ['.xlsx', '.xls']:
@@ -249,34 +387,104 @@ def read_txt_file(file_path: str) -> str:
     # Corriger les chemins réseau si nécessaire
     file_path = fix_network_path(file_path)
     
-    # Essayer différents encodages
+    # Lecture unique du fichier ; les encodages sont ensuite essayés sur ce même tampon
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except PermissionError:
+        logger.warning("Permission refusée pour %s", file_path)
+        return ""
+    except OSError as e:
+        logger.warning("Erreur OS lors de la lecture de %s: %s", file_path, e)
+        return ""
+    
+    return decode_text_bytes(data, file_path)
+
+def decode_text_bytes(data: bytes, label: str = "") -> str:
+    """Décode le contenu d'un fichier texte en mémoire (mêmes encodages que read_txt_file)."""
     encodings = ['utf-8', 'latin1', 'cp1252', 'utf-16', 'ascii']
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
-                # Vérifier si le contenu est valide
-                if content and not content.isspace():
-                    return content
+            content = data.decode(encoding)
+            if content and not content.isspace():
+                # Mêmes fins de ligne qu'une lecture en mode texte (retours universels)
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                return content
         except UnicodeDecodeError:
             continue
-        except PermissionError:
-            logging.warning(f"Permission refusée pour {file_path}")
-            return ""
-        except OSError as e:
-            logging.warning(f"Erreur OS lors de la lecture de {file_path}: {str(e)}")
-            return ""
-    
-    logging.warning(f"Impossible de lire {file_path} avec les encodages standards")
+    
+    logger.warning("Impossible de lire %s avec les encodages standards", label)
     return ""
 
+# Lecteur CSV multithread (optionnel) pour les gros fichiers CSV
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pa_compute
+except ImportError:
+    pa = None
+
+# En dessous de cette taille, un simple décodage du fichier reste plus rapide
+# que l'analyse syntaxique du CSV
+CSV_ARROW_MIN_SIZE = 16 * 1024 * 1024
+CSV_ARROW_BLOCK_SIZE = 4 << 20
+
+def read_csv_file(file_path: str) -> str:
+    """
+    Lit un fichier CSV. Les gros fichiers sont analysés avec pyarrow (en parallèle, sans
+    inférence de types) et convertis, comme les feuilles Excel, en une ligne
+    « colonne: valeurs » par colonne ; les autres sont lus comme du texte.
+    Repli sur read_txt_file en cas d'erreur (encodage autre qu'UTF-8, lignes irrégulières...).
+    """
+    try:
+        if pa is not None and os.path.getsize(file_path) >= CSV_ARROW_MIN_SIZE:
+            return extract_csv_text(file_path)
+    except Exception as e:
+        logger.debug("Lecture pyarrow impossible pour %s, lecture texte: %s", file_path, e)
+    return read_txt_file(file_path)
+
+def extract_csv_text(file_path: str) -> str:
+    """Convertit un CSV (UTF-8) en texte « colonne: valeurs » avec pyarrow."""
+    # Détection du séparateur sur le début du fichier (les CSV français utilisent souvent « ; »)
+    with open(file_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        sample = f.read(64 * 1024)
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = ","
+    
+    read_options = pa_csv.ReadOptions(block_size=CSV_ARROW_BLOCK_SIZE)
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+    # Toutes les colonnes en texte : pas d'inférence de types (les zéros initiaux
+    # des numéros de téléphone sont conservés)
+    with pa_csv.open_csv(file_path, read_options=read_options, parse_options=parse_options) as reader:
+        column_names = reader.schema.names
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in column_names},
+            strings_can_be_null=False
+        )
+    )
+    
+    # Jointure des valeurs de chaque colonne côté pyarrow (sans objets Python par cellule)
+    text_content = []
+    for name, column in zip(table.column_names, table.columns):
+        values = pa_compute.fill_null(column.combine_chunks(), "")
+        joined = pa_compute.binary_join(pa.ListArray.from_arrays([0, len(values)], values), " ")
+        text_content.append(f"{name}: {joined[0].as_py()}")
+    return "\n".join(text_content)
+
 def read_docx_file(file_path: str) -> str:
     """Lit un fichier DOCX avec gestion des erreurs améliorée."""
     from .file_utils import ensure_readable, is_temp_file, fix_network_path
     
     # Ignorer les fichiers temporaires de Word (commençant par ~$)
     if is_temp_file(file_path):
-        logging.info(f"Fichier temporaire Word ignoré: {file_path}")
+        logger.info("Fichier temporaire Word ignoré: %s", file_path)
         return ""
     
     # Vérifier que le fichier est accessible et lisible
@@ -286,22 +494,108 @@ def read_docx_file(file_path: str) -> str:
     # Corriger les chemins réseau si nécessaire
     file_path = fix_network_path(file_path)    
     
+    return extract_docx_text(file_path, file_path)
+
+def extract_docx_text(source, label: str) -> str:
+    """
+    Extrait le texte d'un document DOCX.
+    
+    Args:
+        source: Chemin du fichier ou contenu (bytes) déjà en mémoire
+        label (str): Nom du fichier utilisé dans les messages de log
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    
     try:
-        doc = docx.Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        # Si le texte est vide, essayer de vérifier les tableaux
+        doc = docx.Document(source)
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
+        # Si le texte est vide, essayer de vérifier les tableaux (une seule concaténation
+        # finale, chaque cellule étant suivie d'une espace)
         if not text or text.isspace():
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
+            text += "".join(
+                f"{cell.text} "
+                for table in doc.tables
+                for row in table.rows
+                for cell in row.cells
+            )
         return text
     except (docx.opc.exceptions.PackageNotFoundError, ValueError):
-        logging.info(f"Fichier DOCX inaccessible ou corrompu: {file_path}")
+        logger.info("Fichier DOCX inaccessible ou corrompu: %s", label)
         return ""
     except Exception as e:
-        logging.error(f"Erreur lecture DOCX {file_path}: {str(e)}")
+        logger.error("Erreur lecture DOCX %s: %s", label, e)
+        return ""
+
+# Moteur de lecture des fichiers .xlsx : python-calamine (Rust) s'il est installé, sinon
+# openpyxl en mode lecture seule
+try:
+    import python_calamine
+    XLSX_ENGINE = "calamine"
+except ImportError:
+    python_calamine = None
+    XLSX_ENGINE = "openpyxl"
+
+def iter_xlsx_rows(source):
+    """
+    Parcourt les lignes (valeurs brutes) de la première feuille d'un classeur .xlsx,
+    sans construire de DataFrame. Le classeur est fermé à la fin du parcours.
+    
+    Args:
+        source: Chemin du fichier ou flux binaire
+    """
+    if XLSX_ENGINE == "calamine":
+        workbook = python_calamine.load_workbook(source)
+        try:
+            yield from workbook.get_sheet_by_index(0).iter_rows()
+        finally:
+            workbook.close()
+    else:
+        import openpyxl
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+def xlsx_cell_text(value) -> str:
+    """Texte d'une cellule, sous la même forme que pandas (entiers sans « .0 », dates avec l'heure)."""
+    if value is None:
         return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return str(datetime.datetime(value.year, value.month, value.day))
+    return str(value)
+
+def xlsx_column_labels(header, width: int) -> List[str]:
+    """
+    Noms des colonnes à partir de la ligne d'en-tête, comme pandas : « Unnamed: i » pour
+    une cellule vide, suffixes « .1 », « .2 »... pour les noms en double.
+    """
+    labels = [xlsx_cell_text(header[index]) if index < len(header) else "" for index in range(width)]
+    unnamed = [index for index, label in enumerate(labels) if not label]
+    for index in unnamed:
+        labels[index] = f"Unnamed: {index}"
+    
+    # Colonnes nommées d'abord, puis les colonnes sans nom. Un nom déjà attribué reçoit le
+    # premier suffixe libre (à partir du dernier utilisé pour ce nom) qui n'est ni un nom
+    # de l'en-tête ni un nom déjà attribué
+    unnamed_set = set(unnamed)
+    taken = set(labels)
+    used = set()
+    next_suffix = {}
+    for index in [index for index in range(width) if index not in unnamed_set] + unnamed:
+        base = label = labels[index]
+        if base in used:
+            suffix = next_suffix.get(base, 1)
+            while f"{base}.{suffix}" in taken:
+                suffix += 1
+            label = labels[index] = f"{base}.{suffix}"
+            next_suffix[base] = suffix + 1
+            taken.add(label)
+        used.add(label)
+    return labels
 
 def read_excel_file(file_path: str) -> str:
     """Lit un fichier Excel avec gestion des erreurs améliorée."""
@@ -309,7 +603,7 @@ def read_excel_file(file_path: str) -> str:
     
     # Ignorer les fichiers temporaires d'Excel
     if is_temp_file(file_path):
-        logging.info(f"Fichier temporaire Excel ignoré: {file_path}")
+        logger.info("Fichier temporaire Excel ignoré: %s", file_path)
         return ""
     
     # Vérifier que le fichier est accessible et lisible
@@ -319,14 +613,27 @@ def read_excel_file(file_path: str) -> str:
     # Corriger les chemins réseau si nécessaire
     file_path = fix_network_path(file_path)
     
+    return extract_excel_text(file_path, Path(file_path).suffix.lower(), file_path)
+
+def extract_excel_text(source, ext: str, label: str) -> str:
+    """
+    Extrait le texte de la première feuille (.xls) ou de toutes les colonnes (.xlsx) d'un classeur.
+    
+    Args:
+        source: Chemin du fichier ou contenu (bytes) déjà en mémoire
+        ext (str): Extension du fichier, qui détermine le moteur de lecture
+        label (str): Nom du fichier utilisé dans les messages de log
+    """
+    in_memory = isinstance(source, (bytes, bytearray))
+    
     try:
         # Vérifier l'extension pour utiliser le bon moteur
-        ext = Path(file_path).suffix.lower()
         if ext == '.xls':
             # Anciens fichiers Excel (.xls)
             try:
                 import xlrd
-                with xlrd.open_workbook(file_path) as wb:
+                workbook = xlrd.open_workbook(file_contents=source) if in_memory else xlrd.open_workbook(source)
+                with workbook as wb:
                     sheet = wb.sheet_by_index(0)
                     text_content = []
                     for i in range(sheet.nrows):
@@ -334,24 +641,131 @@ def read_excel_file(file_path: str) -> str:
                         text_content.append(' '.join(row))
                     return '\n'.join(text_content)
             except ImportError:
-                logging.warning(f"Module xlrd non disponible pour lire {file_path}. Installation: pip install xlrd>=2.0.1")
+                logger.warning("Module xlrd non disponible pour lire %s. Installation: pip install xlrd>=2.0.1", label)
                 return ""
         else:
-            # Fichiers Excel plus récents (.xlsx, .xlsm)
-            df = pd.read_excel(file_path, engine='openpyxl')
-            text_content = []
-            for column in df.columns:
-                # Convertir la colonne en chaîne avec gestion des erreurs
-                try:
-                    values = df[column].fillna('').astype(str)
-                    text_content.append(f"{column}: {' '.join(values)}")
-                except Exception as e:
-                    text_content.append(f"{column}: [Erreur de conversion]")
-            return "\n".join(text_content)
+            # Fichiers Excel plus récents (.xlsx, .xlsm) : les cellules sont lues ligne à ligne
+            # en texte puis regroupées par colonne, une ligne « colonne: valeurs » par colonne
+            rows = iter_xlsx_rows(io.BytesIO(source) if in_memory else source)
+            header = next(rows, None)
+            if header is None:
+                return ""
+            columns = [[] for _ in header]
+            # Lignes vides en attente : conservées entre deux lignes remplies, ignorées
+            # en fin de feuille (comme pandas)
+            blank_rows = 0
+            for row in rows:
+                if all(value is None or value == "" for value in row):
+                    blank_rows += 1
+                    continue
+                while len(columns) < len(row):
+                    columns.append([""] * len(columns[0]) if columns else [])
+                for index, column in enumerate(columns):
+                    column.extend([""] * blank_rows)
+                    column.append(xlsx_cell_text(row[index]) if index < len(row) else "")
+                blank_rows = 0
+            labels = xlsx_column_labels(header, len(columns))
+            return "\n".join(
+                f"{label}: {' '.join(values)}" for label, values in zip(labels, columns)
+            )
     except Exception as e:
-        logging.error(f"Erreur lecture Excel {file_path}: {str(e)}")
+        logger.error("Erreur lecture Excel %s: %s", label, e)
         return ""
 
+# Tampons réutilisés pour la lecture des PDF (repli PyPDF2) : évite d'allouer puis libérer
+# un bloc mémoire pour chaque fichier d'une analyse de dossier. Seuls les tampons d'au plus
+# _MAX_POOLED_BUFFER_SIZE sont conservés : le pool occupe au plus 4 × 8 Mo par processus,
+# les fichiers plus gros ont un tampon à leur taille exacte, libéré après lecture.
+_BUFFER_POOL_SIZE = 4
+_MIN_BUFFER_SIZE = 64 * 1024
+_MAX_POOLED_BUFFER_SIZE = 8 * 1024 * 1024
+_buffer_pool = queue.LifoQueue(maxsize=_BUFFER_POOL_SIZE)
+
+def acquire_buffer(size: int) -> bytearray:
+    """
+    Retourne un tampon d'au moins `size` octets : pris dans le pool si possible, sinon alloué
+    (taille arrondie à la puissance de 2 supérieure, sauf au-delà de _MAX_POOLED_BUFFER_SIZE).
+    """
+    if size > _MAX_POOLED_BUFFER_SIZE:
+        return bytearray(size)
+    try:
+        buffer = _buffer_pool.get_nowait()
+    except queue.Empty:
+        buffer = None
+    if buffer is not None:
+        if len(buffer) >= size:
+            return buffer
+        # Trop petit pour ce fichier : il reste disponible pour les suivants
+        release_buffer(buffer)
+    return bytearray(max(_MIN_BUFFER_SIZE, 1 << max(size - 1, 0).bit_length()))
+
+def release_buffer(buffer: bytearray) -> None:
+    """Remet un tampon dans le pool (abandonné s'il dépasse la taille maximale ou si le pool est plein)."""
+    if len(buffer) > _MAX_POOLED_BUFFER_SIZE:
+        return
+    try:
+        _buffer_pool.put_nowait(buffer)
+    except queue.Full:
+        pass
+
+class _BufferStream(io.RawIOBase):
+    """Flux binaire en lecture seule sur une vue mémoire, sans copie du contenu."""
+    
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, b):
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self._pos += n
+        return n
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+    
+    def tell(self):
+        return self._pos
+
+@contextmanager
+def pooled_file_stream(file_path: str):
+    """Charge un fichier en une seule lecture dans un tampon du pool et fournit un flux dessus."""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = acquire_buffer(size)
+        try:
+            n = f.readinto(memoryview(buffer)[:size])
+        except BaseException:
+            release_buffer(buffer)
+            raise
+    try:
+        yield _BufferStream(memoryview(buffer)[:n])
+    finally:
+        release_buffer(buffer)
+
+# Extraction de texte PDF native (PDFium, C++) si pypdfium2 est installé
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PDFium n'est pas thread-safe (des appels simultanés peuvent faire planter l'interpréteur) :
+# un seul thread à la fois l'utilise dans un processus (threads de scan_files sous Windows,
+# tâches en arrière-plan, thread de l'interface)
+_pdfium_lock = threading.Lock()
+
 def read_pdf_file(file_path: str) -> str:
     """Lit un fichier PDF avec gestion robuste des erreurs."""
     from .file_utils import ensure_readable, fix_network_path
@@ -363,9 +777,58 @@ def read_pdf_file(file_path: str) -> str:
     # Corriger les chemins réseau si nécessaire
     file_path = fix_network_path(file_path)
     
+    return extract_pdf_text(file_path, file_path)
+
+def extract_pdf_text_pdfium(source, label: str) -> str:
+    """
+    Extrait le texte d'un PDF avec PDFium ; les pages et le document sont fermés
+    explicitement pour ne pas garder de descripteurs ouverts pendant une analyse de dossier.
+    Tous les appels PDFium (ouverture et fermeture comprises) se font sous _pdfium_lock.
+    """
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            text = []
+            for index in range(len(pdf)):
+                try:
+                    page = pdf[index]
+                    try:
+                        textpage = page.get_textpage()
+                        try:
+                            page_text = textpage.get_text_range()
+                        finally:
+                            textpage.close()
+                    finally:
+                        page.close()
+                except Exception as page_e:
+                    logger.warning("Erreur d'extraction de page dans %s: %s", label, page_e)
+                    continue
+                if page_text:
+                    # PDFium sépare les lignes par « \r\n »
+                    text.append(page_text.replace("\r\n", "\n"))
+            return "\n".join(text)
+        finally:
+            pdf.close()
+
+def extract_pdf_text(source, label: str) -> str:
+    """
+    Extrait le texte d'un PDF avec PDFium (si disponible) ou PyPDF2, puis pdfplumber en cas d'échec.
+    
+    Args:
+        source: Chemin du fichier ou contenu (bytes) déjà en mémoire
+        label (str): Nom du fichier utilisé dans les messages de log
+    """
+    in_memory = isinstance(source, (bytes, bytearray))
+    
+    if pdfium is not None:
+        try:
+            return extract_pdf_text_pdfium(bytes(source) if in_memory else source, label)
+        except Exception as e:
+            logger.warning("PDFium a échoué pour %s, erreur: %s", label, e)
+    
     try:
         # Essayer d'abord avec PyPDF2
-        with open(file_path, 'rb') as file:
+        with (io.BytesIO(source) if in_memory else pooled_file_stream(source)) as file:
             try:
                 reader = PdfReader(file, strict=False)
                 text = []
@@ -375,16 +838,16 @@ def read_pdf_file(file_path: str) -> str:
                         if page_text:
                             text.append(page_text)
                     except Exception as page_e:
-                        logging.warning(f"Erreur d'extraction de page dans {file_path}: {str(page_e)}")
+                        logger.warning("Erreur d'extraction de page dans %s: %s", label, page_e)
                         continue
                 return "\n".join(text)
             except Exception as e:
-                logging.warning(f"PyPDF2 a échoué pour {file_path}, erreur: {str(e)}")
+                logger.warning("PyPDF2 a échoué pour %s, erreur: %s", label, e)
                 
                 # Tenter avec pdfplumber comme alternative si PyPDF2 échoue
                 try:
                     import pdfplumber
-                    with pdfplumber.open(file_path) as pdf:
+                    with pdfplumber.open(io.BytesIO(source) if in_memory else source) as pdf:
                         text = []
                         for page in pdf.pages:
                             try:
@@ -395,64 +858,304 @@ def read_pdf_file(file_path: str) -> str:
                                 continue
                         return "\n".join(text)
                 except (ImportError, Exception) as plumb_e:
-                    logging.error(f"Toutes les méthodes d'extraction PDF ont échoué pour {file_path}: {str(plumb_e)}")
+                    logger.error("Toutes les méthodes d'extraction PDF ont échoué pour %s: %s", label, plumb_e)
                     return ""
     except Exception as e:
-        logging.error(f"Erreur lecture PDF {file_path}: {str(e)}")
+        logger.error("Erreur lecture PDF %s: %s", label, e)
         return ""
 
 def analyze_file(file_path: str) -> Dict[str, Any]:
     """Analyse un fichier et retourne les résultats avec niveaux de confiance."""
-    from .file_utils import should_skip_file
+    return analyze_files([file_path])[0]
+
+def read_file_text(file_path: str) -> str:
+    """Extrait le texte d'un fichier selon son type (chaîne vide si type non géré)."""
+    file_type = get_file_type(file_path)
+    if file_type == 'csv':
+        return read_csv_file(file_path)
+    elif file_type == 'text':
+        return read_txt_file(file_path)
+    elif file_type == 'word':
+        return read_docx_file(file_path)
+    elif file_type == 'excel':
+        return read_excel_file(file_path)
+    elif file_type == 'pdf':
+        return read_pdf_file(file_path)
+    return ""
+
+def analyze_files(file_paths: List[str], batch_size: int = NER_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    Analyse plusieurs fichiers en regroupant la NER des textes extraits via nlp.pipe.
+    
+    Args:
+        file_paths (List[str]): Chemins des fichiers à analyser
+        batch_size (int): Nombre de documents traités ensemble par spaCy
+        
+    Returns:
+        List[Dict[str, Any]]: Un résultat par fichier (None si ignoré, vide ou en erreur),
+        dans l'ordre des chemins
+    """
+    from .file_utils import filter_files
+    
+    results = [None] * len(file_paths)
+    extracted = []  # (index, chemin, type, texte)
+    
+    # Fichiers à ignorer (stat des fichiers du lot faits en parallèle)
+    kept_paths = set(filter_files(file_paths))
+    
+    for index, file_path in enumerate(file_paths):
+        if file_path not in kept_paths:
+            continue
+        try:
+            text_content = read_file_text(file_path)
+            if text_content:
+                extracted.append((index, file_path, get_file_type(file_path), text_content))
+        except Exception as e:
+            logger.error("Erreur analyse fichier %s: %s", file_path, e)
+    
+    detections = detect_personal_data_batch(
+        [(text_content, file_path) for _, file_path, _, text_content in extracted],
+        batch_size=batch_size
+    )
+    for (index, file_path, file_type, text_content), personal_data in zip(extracted, detections):
+        try:
+            results[index] = build_file_result(file_path, file_type, text_content, personal_data)
+        except Exception as e:
+            logger.error("Erreur analyse fichier %s: %s", file_path, e)
+    
+    return results
+
+def analyze_batch(file_paths: List[str]) -> List[Tuple[str, Any, Any]]:
+    """
+    Analyse un lot de fichiers dans un processus de travail (NER regroupée via nlp.pipe)
+    
+    Returns:
+        list: Tuples (chemin, résultat ou None, message d'erreur ou None)
+    """
+    try:
+        results = analyze_files(file_paths)
+    except Exception as e:
+        return [(file_path, None, str(e)[:50] + "...") for file_path in file_paths]
+    return [(file_path, result, None) for file_path, result in zip(file_paths, results)]
+
+def scan_files(file_paths, max_workers: int = None, chunksize: int = SCAN_CHUNKSIZE):
+    """
+    Analyse des fichiers en parallèle et produit les résultats au fil de l'eau.
+    
+    L'analyse (NER, regex, extraction PDF/DOCX) est limitée par le CPU : elle est répartie
+    sur plusieurs processus, chacun chargeant le modèle spaCy une seule fois. Le contexte
+    "spawn" évite de forker un processus Streamlit multi-threadé. Sous Windows, où le
+    lancement des processus est coûteux, on se rabat sur des threads (l'extraction
+    PDF/DOCX et spaCy libèrent en partie le GIL).
+    
+    Args:
+        file_paths: Chemins à analyser (itérable éventuellement paresseux)
+        max_workers (int): Nombre de processus (par défaut, nombre de cœurs)
+        chunksize (int): Nombre de fichiers par lot, pour amortir les échanges entre processus
+        
+    Yields:
+        tuple: (chemin, résultat ou None, message d'erreur ou None), dans l'ordre
+        où les lots se terminent
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if os.name == "nt":
+        executor = ThreadPoolExecutor(max_workers=max_workers, initializer=initialize_nlp)
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=initialize_nlp)
+    
+    # Nombre maximal de lots soumis et non terminés : la découverte des fichiers avance
+    # au rythme de l'analyse au lieu d'être matérialisée d'un coup
+    max_pending = max_workers * 2
+    with executor:
+        files_iter = iter(file_paths)
+        pending = {}
+        
+        while True:
+            while len(pending) < max_pending:
+                batch = list(itertools.islice(files_iter, chunksize))
+                if not batch:
+                    break
+                pending[executor.submit(analyze_batch, batch)] = batch
+            if not pending:
+                break
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    # Le processus de travail a échoué : tout le lot est en erreur
+                    outcomes = [(file_path, None, str(e)[:50] + "...") for file_path in batch]
+                yield from outcomes
+
+def iter_directory_files(root: str):
+    """
+    Parcourt récursivement un répertoire avec os.scandir
+    
+    Les DirEntry fournissent directement le type de l'entrée (sans stat supplémentaire
+    dans la plupart des cas) ; les liens symboliques ne sont pas suivis.
+    
+    Yields:
+        tuple: (nom du fichier, chemin complet)
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.name, entry.path
+        except OSError:
+            # Répertoire illisible : on l'ignore, comme os.walk
+            continue
+
+def iter_supported_files(directory_path: str, excluded_extensions=None, max_files: int = None):
+    """
+    Fichiers à analyser d'un répertoire (supportés, extension non exclue, hors fichiers temporaires)
     
-    # Vérifier si le fichier doit être ignoré
-    if should_skip_file(file_path):
+    Args:
+        directory_path (str): Répertoire à parcourir récursivement
+        excluded_extensions (list): Extensions à ignorer (avec ou sans point)
+        max_files (int): Nombre maximal de fichiers (aucune limite si None ou 0)
+    """
+    from .file_utils import is_temp_file
+    
+    # Normaliser une seule fois les extensions exclues (".ext" en minuscules) et
+    # en déduire les extensions à analyser
+    excluded = frozenset(
+        ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+        for ext in excluded_extensions or ()
+    )
+    allowed = SUPPORTED_SUFFIXES - excluded
+    
+    candidates = (
+        file_path for file_name, file_path in iter_directory_files(directory_path)
+        if os.path.splitext(file_name)[1].lower() in allowed and not is_temp_file(file_path)
+    )
+    if max_files and max_files > 0:
+        candidates = itertools.islice(candidates, max_files)
+    return candidates
+
+def scan_directory(directory_path: str, excluded_extensions=None, max_files: int = None,
+                   max_workers: int = None, chunksize: int = SCAN_CHUNKSIZE):
+    """
+    Analyse en parallèle les fichiers supportés d'un répertoire (voir scan_files).
+    
+    Yields:
+        tuple: (chemin, résultat ou None, message d'erreur ou None)
+    """
+    yield from scan_files(iter_supported_files(directory_path, excluded_extensions, max_files),
+                          max_workers=max_workers, chunksize=chunksize)
+
+def build_file_result(file_path: str, file_type: str, text_content: str,
+                      personal_data: Dict[str, List[Any]] = None) -> Dict[str, Any]:
+    """
+    Construit la ligne de résultat d'un fichier à partir de son texte extrait.
+    Les données personnelles sont détectées ici si elles ne sont pas fournies.
+    """
+    if personal_data is None:
+        personal_data = detect_personal_data(text_content, file_path)
+    
+    result = {
+        "file_path": file_path,
+        "file_type": file_type,
+        "text_snippet": text_content[:100],
+    }
+    
+    # Pour chaque type de données, extraire les valeurs et les niveaux de confiance
+    for data_type in personal_data:
+        values = [item["value"] for item in personal_data[data_type]]
+        confidences = [item["confidence"] for item in personal_data[data_type]]
+        result[f"{data_type}_found"] = ", ".join(values)
+        result[f"{data_type}_confidence"] = ", ".join([f"{conf:.2f}" for conf in confidences])
+    
+        # Définir un facteur de risque (plus élevé pour les données très sensibles)
+        risk_factor = 3 if data_type in ["secu", "emails", "phones"] else 1
+        if data_type in ["postal_addresses", "ip_addresses"]:
+            risk_factor = 2
+        risk_scores = [conf * risk_factor for conf in confidences]
+        result[f"{data_type}_risk"] = sum(risk_scores) / len(risk_scores) if risk_scores else 0
+    
+    return result
+
+def analyze_bytes(file_name: str, content: bytes) -> Dict[str, Any]:
+    """
+    Analyse un fichier déjà chargé en mémoire (ex. fichier téléchargé), sans passer par le disque.
+    
+    Args:
+        file_name (str): Nom d'origine du fichier (détermine le type et sert de file_path)
+        content (bytes): Contenu brut du fichier
+        
+    Returns:
+        Dict[str, Any]: Résultats de l'analyse, ou None si le fichier est ignoré ou vide
+    """
+    from .file_utils import is_temp_file
+    
+    # Mêmes règles que should_skip_file pour les fichiers temporaires et volumineux (> 50 Mo)
+    if is_temp_file(file_name):
+        return None
+    if len(content) > 50 * 1024 * 1024:
+        logger.warning("Skipping large file (>50MB): %s", file_name)
         return None
     
-    file_type = get_file_type(file_path)
+    file_type = get_file_type(file_name)
     text_content = ""
-
+    
     try:
-        if file_type == 'text':
-            text_content = read_txt_file(file_path)
+        if file_type in ('text', 'csv'):
+            text_content = decode_text_bytes(content, file_name)
         elif file_type == 'word':
-            text_content = read_docx_file(file_path)
+            text_content = extract_docx_text(content, file_name)
         elif file_type == 'excel':
-            text_content = read_excel_file(file_path)
+            text_content = extract_excel_text(content, os.path.splitext(file_name)[1].lower(), file_name)
         elif file_type == 'pdf':
-            text_content = read_pdf_file(file_path)
-
+            text_content = extract_pdf_text(content, file_name)
+        
         if text_content:
-            personal_data = detect_personal_data(text_content, file_path)
-            
-            result = {
-                "file_path": file_path,
-                "file_type": file_type,
-                "text_snippet": text_content[:100],
-            }
-            
-            # Pour chaque type de données, extraire les valeurs et les niveaux de confiance
-            for data_type in personal_data:
-                values = [item["value"] for item in personal_data[data_type]]
-                confidences = [item["confidence"] for item in personal_data[data_type]]
-                result[f"{data_type}_found"] = ", ".join(values)
-                result[f"{data_type}_confidence"] = ", ".join([f"{conf:.2f}" for conf in confidences])
-                
-                # Définir un facteur de risque (plus élevé pour les données très sensibles)
-                risk_factor = 3 if data_type in ["secu", "emails", "phones"] else 1
-                if data_type in ["postal_addresses", "ip_addresses"]:
-                    risk_factor = 2
-                risk_scores = [conf * risk_factor for conf in confidences]
-                result[f"{data_type}_risk"] = sum(risk_scores) / len(risk_scores) if risk_scores else 0
-            
-            return result
+            return build_file_result(file_name, file_type, text_content)
     except Exception as e:
-        logging.error(f"Erreur analyse fichier {file_path}: {str(e)}")
+        logger.error("Erreur analyse fichier %s: %s", file_name, e)
     
     return None
 
-def calculate_risk_scores(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Calcule des scores de risque agrégés pour les résultats."""
+# Types de données et poids utilisés pour le score de risque d'un fichier
+RISK_DATA_TYPES = ("emails", "phones", "names", "secu", "siret", "postal_addresses", "ip_addresses")
+RISK_WEIGHTS = np.array([5, 5, 3, 10, 2, 2, 2], dtype=np.float64)
+
+def _risk_matrix(results) -> np.ndarray:
+    """Matrice fichiers x types des scores de risque bruts (0 pour une valeur absente ou vide)."""
+    if isinstance(results, pd.DataFrame):
+        columns = []
+        for data_type in RISK_DATA_TYPES:
+            column = results.get(f"{data_type}_risk")
+            if column is None:
+                columns.append(np.zeros(len(results)))
+            elif pd.api.types.is_numeric_dtype(column):
+                columns.append(column.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                columns.append(np.array([float(value) if value else 0.0 for value in column], dtype=np.float64))
+        return np.column_stack(columns) if len(results) else np.zeros((0, len(RISK_DATA_TYPES)))
+    
+    return np.array([
+        [float(result[f"{data_type}_risk"]) if result.get(f"{data_type}_risk") else 0.0
+         for data_type in RISK_DATA_TYPES]
+        for result in results
+    ], dtype=np.float64).reshape(len(results), len(RISK_DATA_TYPES))
+
+def calculate_risk_scores(results) -> Dict[str, Any]:
+    """
+    Calcule des scores de risque agrégés pour les résultats.
+    
+    Args:
+        results: Liste de résultats (dictionnaires) ou DataFrame de résultats ; un DataFrame
+            est lu colonne par colonne, sans conversion en dictionnaires
+    """
     risk_analysis = {
         "high_risk_files": [],
         "medium_risk_files": [],
@@ -470,47 +1173,44 @@ def calculate_risk_scores(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         "total_analyzed": len(results)
     }
     
-    risk_weights = {
-        "secu": 10,
-        "emails": 5,
-        "phones": 5,
-        "names": 3,
-        "siret": 2,
-        "postal_addresses": 2,
-        "ip_addresses": 2
-    }
+    # Matrice fichiers x types des risques, pondérée en une seule opération
+    risk_values = _risk_matrix(results)
+    weighted = risk_values * RISK_WEIGHTS
+    file_risks = weighted.sum(axis=1)
     
-    for result in results:
-        file_risk = 0
-        for data_type in ["emails", "phones", "names", "secu", "siret", "postal_addresses", "ip_addresses"]:
-            risk_key = f"{data_type}_risk"
-            if risk_key in result and result[risk_key]:
-                risk_score = float(result[risk_key]) * risk_weights[data_type]
-                file_risk += risk_score
-                risk_analysis["risk_by_type"][data_type] += risk_score
-        
-        if file_risk > 20:
-            risk_analysis["high_risk_files"].append({
-                "path": result["file_path"],
-                "score": file_risk,
-                "type": result["file_type"]
-            })
-        elif file_risk > 10:
-            risk_analysis["medium_risk_files"].append({
-                "path": result["file_path"],
-                "score": file_risk,
-                "type": result["file_type"]
-            })
-        elif file_risk > 0:
-            risk_analysis["low_risk_files"].append({
-                "path": result["file_path"],
-                "score": file_risk,
-                "type": result["file_type"]
-            })
-            
-        extension = Path(result["file_path"]).suffix.lower()
-        if file_risk > 0:
-            risk_analysis["top_risky_extensions"][extension] = risk_analysis["top_risky_extensions"].get(extension, 0) + 1
+    # Un type sans aucune détection garde un total entier de 0
+    type_totals = weighted.sum(axis=0)
+    type_detected = (risk_values != 0).any(axis=0)
+    for index, data_type in enumerate(RISK_DATA_TYPES):
+        if type_detected[index]:
+            risk_analysis["risk_by_type"][data_type] = float(type_totals[index])
+    
+    # Chemins et types des fichiers (lus seulement s'il y a des fichiers à risque)
+    if isinstance(results, pd.DataFrame):
+        def field(index, name):
+            return results[name].iat[index]
+    else:
+        def field(index, name):
+            return results[index][name]
+    
+    # Répartition par niveau de risque (dans l'ordre des fichiers, trié ensuite par score)
+    for bucket, mask in (
+        ("high_risk_files", file_risks > 20),
+        ("medium_risk_files", (file_risks > 10) & (file_risks <= 20)),
+        ("low_risk_files", (file_risks > 0) & (file_risks <= 10)),
+    ):
+        risk_analysis[bucket] = [
+            {
+                "path": field(index, "file_path"),
+                "score": float(file_risks[index]),
+                "type": field(index, "file_type")
+            }
+            for index in np.flatnonzero(mask)
+        ]
+    
+    for index in np.flatnonzero(file_risks > 0):
+        extension = Path(field(index, "file_path")).suffix.lower()
+        risk_analysis["top_risky_extensions"][extension] = risk_analysis["top_risky_extensions"].get(extension, 0) + 1
     
     risk_analysis["high_risk_files"] = sorted(risk_analysis["high_risk_files"], key=lambda x: x["score"], reverse=True)
     risk_analysis["medium_risk_files"] = sorted(risk_analysis["medium_risk_files"], key=lambda x: x["score"], reverse=True)
@@ -538,10 +1238,7 @@ def generate_false_positives_report(results: List[Dict[str, Any]]) -> List[Dict[
                 is_likely_false_positive = False
                 if confidence < 0.4 or len(name.split()) < 2:
                     is_likely_false_positive = True
-                if any(org.lower() in name.lower() for org in ORGANIZATION_UNITS):
-                    is_likely_false_positive = True
-                title_indicators = ["service", "département", "direction", "unité", "pôle", "responsable", "chef"]
-                if any(indicator.lower() in name.lower() for indicator in title_indicators):
+                if FALSE_POSITIVE_NAME_MATCHER.contains_any(name.lower()):
                     is_likely_false_positive = True
                 if is_likely_false_positive:
                     false_positives.append({
@@ -554,11 +1251,129 @@ def generate_false_positives_report(results: List[Dict[str, Any]]) -> List[Dict[
     
     return false_positives
 
-def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]:
+# Préfixes de titre acceptés par validate_person_name pour un nom sans majuscule
+NAME_TRIGGER_RE = re.compile(r"\b(?:m\.|mr|mme|dr|prof|monsieur|madame|docteur)")
+# Majuscules latines (ASCII, Latin-1, Œ, Ÿ) : recherche en C, arrêtée à la première trouvée
+LATIN_UPPERCASE_RE = re.compile(r"[A-ZÀ-ÖØ-ÞŒŸ]")
+
+def may_contain_person_name(text: str) -> bool:
+    """
+    Pré-filtre peu coûteux avant la NER : validate_person_name n'accepte que des noms
+    comportant une majuscule ou commençant par un titre (M., Mme, Dr...). Un texte
+    sans aucune majuscule ni titre (journaux, listes d'adresses IP, CSV numériques...)
+    ne peut donc produire aucun nom valide et n'est pas envoyé à spaCy.
+    """
+    if LATIN_UPPERCASE_RE.search(text) or NAME_TRIGGER_RE.search(text):
+        return True
+    # Sans majuscule latine : un texte ASCII, ou dont toutes les lettres sont en minuscules
+    # (islower, sans copie), n'a aucune majuscule ; sinon (autres alphabets), test exact
+    if text.isascii() or text.islower():
+        return False
+    return any(char.isupper() for char in text)
+
+def ner_cache_key(text: str) -> bytes:
+    """Empreinte (blake2b 128 bits) du texte réellement transmis à spaCy."""
+    return hashlib.blake2b(text[:NER_MAX_LENGTH].encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+def get_cached_person_entities(key: bytes):
+    """Retourne les entités PER en cache pour cette empreinte, ou None."""
+    with _ner_cache_lock:
+        entities = _ner_cache.get(key)
+        if entities is not None:
+            _ner_cache.move_to_end(key)
+        return entities
+
+def iter_ner_chunks(text: str, size: int = NER_CHUNK_SIZE):
+    """
+    Découpe un texte en morceaux d'au plus `size` caractères pour la NER, coupés de
+    préférence après la dernière fin de ligne ou de phrase du morceau.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start + size
+        if end < length:
+            cut = max(text.rfind("\n", start, end), text.rfind(". ", start, end))
+            if cut > start:
+                end = cut + 1
+        yield text[start:end]
+        start = end
+
+def cache_person_entities(key: bytes, docs) -> tuple:
+    """Extrait les entités PER des Doc spaCy d'un texte et les met en cache (éviction LRU)."""
+    entities = tuple(ent.text for doc in docs for ent in doc.ents if ent.label_ == "PER")
+    with _ner_cache_lock:
+        _ner_cache[key] = entities
+        _ner_cache.move_to_end(key)
+        if len(_ner_cache) > NER_CACHE_SIZE:
+            _ner_cache.popitem(last=False)
+    return entities
+
+def detect_personal_data_batch(items: List[Tuple[str, str]], batch_size: int = NER_BATCH_SIZE) -> List[Dict[str, List[Any]]]:
+    """
+    Détecte les données personnelles de plusieurs textes, la NER étant faite par lots avec nlp.pipe.
+    
+    Args:
+        items (List[Tuple[str, str]]): Couples (texte, chemin du fichier)
+        batch_size (int): Nombre de documents traités ensemble par spaCy
+        
+    Returns:
+        List[Dict]: Résultats de detect_personal_data pour chaque texte, dans le même ordre
+    """
+    nlp = initialize_nlp()
+    results = [None] * len(items)
+    
+    # Seuls les textes analysables et absents du cache passent par spaCy (une seule fois
+    # pour des textes identiques du lot)
+    pending = {}  # empreinte -> index des textes concernés
+    for index, (text, file_path) in enumerate(items):
+        if not text or len(text) < 3:
+            continue
+        if not may_contain_person_name(text[:NER_MAX_LENGTH]):
+            results[index] = detect_personal_data(text, file_path, person_entities=())
+            continue
+        key = ner_cache_key(text)
+        entities = get_cached_person_entities(key)
+        if entities is not None:
+            results[index] = detect_personal_data(text, file_path, person_entities=entities)
+        else:
+            pending.setdefault(key, []).append(index)
+    
+    # Les Doc sont exploités au fil de l'eau pour ne pas garder en mémoire les tenseurs
+    # de tout un lot ; les morceaux d'un même texte se suivent et sont regroupés par empreinte
+    ner_inputs = (
+        (chunk, key)
+        for key, indexes in pending.items()
+        for chunk in iter_ner_chunks(items[indexes[0]][0][:NER_MAX_LENGTH])
+    )
+    try:
+        docs = nlp.pipe(ner_inputs, as_tuples=True, batch_size=batch_size)
+        for key, group in itertools.groupby(docs, key=lambda doc_key: doc_key[1]):
+            entities = cache_person_entities(key, (doc for doc, _ in group))
+            for index in pending[key]:
+                text, file_path = items[index]
+                results[index] = detect_personal_data(text, file_path, person_entities=entities)
+    except Exception as e:
+        logger.error("Erreur lors de l'analyse NER: %s", e)
+    
+    # Textes trop courts, ou non traités suite à une erreur de spaCy
+    for index, (text, file_path) in enumerate(items):
+        if results[index] is None:
+            results[index] = detect_personal_data(text, file_path)
+    
+    return results
+
+def detect_personal_data(text: str, file_path: str = "", person_entities=None) -> Dict[str, List[Any]]:
     """
     Détecte les données personnelles avec validation et scoring.
     Inclut les détections pour adresses postales et adresses IP.
     
+    Args:
+        text (str): Texte à analyser
+        file_path (str): Chemin du fichier d'origine (pour les logs)
+        person_entities: Entités PER déjà extraites pour ce texte (sinon la NER est faite
+            ici, ou reprise du cache)
+    
     Returns:
         Dict avec "emails", "phones", "dates", "names", "secu", "siret",
         "postal_addresses" et "ip_addresses" et leurs niveaux de confiance.
@@ -580,13 +1395,26 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
         return results
         
     # Détection si le document est un template/exemple
-    is_template = any(indicator in text.lower() for indicator in TEMPLATE_INDICATORS)
+    text_lower = text.lower()
+    is_template = TEMPLATE_MATCHER.contains_any(text_lower)
     if is_template:
-        logging.info(f"Document détecté comme template/exemple: {file_path}")
+        logger.info("Document détecté comme template/exemple: %s", file_path)
 
     try:
+        # Types de données présents selon le préfiltre Hyperscan (None : tout rechercher)
+        candidates = prefilter_data_types(text)
+        
+        # Un seul parcours du texte pour emails, téléphones, IP, dates, sécu et SIRET
+        found = {"email": [], "phone": [], "ip": [], "date": [], "secu": [], "siret": []}
+        if candidates is None or not candidates.isdisjoint(found):
+            for match in PERSONAL_DATA_REGEX.finditer(text):
+                found[match.lastgroup].append(match.group())
+        # Chaque valeur distincte n'est validée et rapportée qu'une fois (ordre d'apparition
+        # conservé) : une même adresse répétée dans un journal ne multiplie pas le travail
+        found = {data_type: list(dict.fromkeys(values)) for data_type, values in found.items()}
+        
         # Emails
-        found_emails = EMAIL_REGEX.findall(text)
+        found_emails = found["email"]
         for email in found_emails:
             if validate_email(email):
                 # Réduire le score de confiance pour les emails dans des templates
@@ -598,13 +1426,13 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                     })
 
         # Téléphones - avec gestion renforcée des formats
-        found_phones = PHONE_REGEX.findall(text)
+        found_phones = found["phone"]
         for phone in found_phones:
             if validate_phone(phone):
                 # Réduire la confiance si format standard ou dans un template
                 if is_template:
                     confidence = 0.7
-                elif re.match(r'^0[1-9](?: \d{2}){4}$', phone):  # Format très courant
+                elif COMMON_PHONE_FORMAT_REGEX.match(phone):  # Format très courant
                     confidence = 0.75
                 else:
                     confidence = 0.85
@@ -614,13 +1442,7 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                 })
 
         # Dates
-        found_dates = DATE_REGEX.findall(text)
-        if isinstance(found_dates, list) and found_dates and isinstance(found_dates[0], tuple):
-            dates = ["/".join(d) for d in found_dates]
-        else:
-            dates = found_dates if isinstance(found_dates, list) else []
-        
-        for date in dates:
+        for date in found["date"]:
             if validate_date(date):
                 results["dates"].append({
                     "value": date,
@@ -628,7 +1450,7 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                 })
 
         # Numéros de sécurité sociale
-        found_secu = SECU_REGEX.findall(text)
+        found_secu = found["secu"]
         for secu in found_secu:
             if validate_secu(secu):
                 # Score très élevé pour ce type de données très sensibles
@@ -638,7 +1460,7 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                 })
 
         # SIRET
-        found_siret = SIRET_REGEX.findall(text)
+        found_siret = found["siret"]
         for siret in found_siret:
             if validate_siret(siret):
                 # Score élevé mais un peu moins que sécu
@@ -649,25 +1471,33 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
 
         # Détection via spaCy pour les noms avec gestion améliorée du contexte
         try:
-            # Limiter la taille du texte pour éviter les problèmes de mémoire avec spaCy
-            max_length = min(len(text), 100000)
-            doc = nlp(text[:max_length])
+            if person_entities is None and not may_contain_person_name(text[:NER_MAX_LENGTH]):
+                person_entities = ()
+            if person_entities is None:
+                key = ner_cache_key(text)
+                person_entities = get_cached_person_entities(key)
+                if person_entities is None:
+                    # Texte découpé en morceaux traités ensemble par nlp.pipe (mémoire bornée)
+                    person_entities = cache_person_entities(
+                        key, nlp.pipe(iter_ner_chunks(text[:NER_MAX_LENGTH]), batch_size=8)
+                    )
             
-            for ent in doc.ents:
-                # Vérifier si c'est une entité de type personne et qu'elle n'est pas déjà ignorée
-                if ent.label_ == "PER" and ent.label_ != "IGNORED_ENTITY":
-                    name = ent.text.strip()
-                    is_valid, confidence = validate_person_name(name, text)
-                    if is_valid and not is_likely_organizational_name(text, name):
-                        results["names"].append({
-                            "value": name,
-                            "confidence": confidence
-                        })
+            # Entités de type personne (les entités ignorées par l'entity_ruler ont un autre label)
+            for name in dict.fromkeys(entity_text.strip() for entity_text in person_entities):
+                is_valid, confidence = validate_person_name(name, text, text_lower)
+                if is_valid and not is_likely_organizational_name(text, name, text_lower):
+                    results["names"].append({
+                        "value": name,
+                        "confidence": confidence
+                    })
         except Exception as e:
-            logging.error(f"Erreur lors de l'analyse NER: {str(e)}")
+            logger.error("Erreur lors de l'analyse NER: %s", e)
 
         # Détection d'adresses postales
-        found_postal_addresses = POSTAL_ADDRESS_REGEX.findall(text)
+        if (candidates is None or "postal" in candidates) and POSTAL_CODE_ANCHOR_RE.search(text):
+            found_postal_addresses = list(dict.fromkeys(POSTAL_ADDRESS_REGEX.findall(text)))
+        else:
+            found_postal_addresses = []
         for address in found_postal_addresses:
             if validate_postal_address(address):
                 # On réduit la confiance si le document est un template
@@ -678,7 +1508,7 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                 })
 
         # Détection d'adresses IP
-        found_ips = IP_ADDRESS_REGEX.findall(text)
+        found_ips = found["ip"]
         for ip in found_ips:
             if validate_ip_address(ip):
                 # Ajuster la confiance pour les IPs - plus élevée pour IPs privées
@@ -691,7 +1521,7 @@ def detect_personal_data(text: str, file_path: str = "") -> Dict[str, List[Any]]
                     "confidence": confidence
                 })
     except Exception as e:
-        logging.error(f"Erreur lors de la détection des données personnelles: {str(e)}")
+        logger.error("Erreur lors de la détection des données personnelles: %s", e)
 
     # Filtrage final selon seuils de confiance
     filtered_results = {key: [] for key in results}
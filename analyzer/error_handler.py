@@ -1,10 +1,30 @@
 # analyzer/error_handler.py
 import logging
 import os
-import json
+import time
+import heapq
+import functools
+import atexit
+import operator
+import re
+import sys
+import threading
 import traceback
 from datetime import datetime
 from pathlib import Path
+import orjson
+
+from .file_utils import atomic_write_bytes, file_lock
+
+logger = logging.getLogger(__name__)
+
+# Fonctions de lecture dont la valeur par défaut en cas d'erreur est une chaîne vide
+_EMPTY_STR_FNS = frozenset({"read_txt_file", "read_docx_file", "read_excel_file", "read_pdf_file"})
+
+# Types d'exceptions classés directement (sous-classes comprises)
+_FILE_ACCESS_EXCS = (FileNotFoundError, NotADirectoryError)
+_PERM_EXCS = (PermissionError,)
+_MEM_EXCS = (MemoryError, OverflowError)
 
 class ErrorHandler:
     """
@@ -12,6 +32,30 @@ class ErrorHandler:
     Permet de centraliser, classer et traiter les erreurs.
     """
     
+    # Le résumé est tenu en mémoire et écrit sur disque au plus toutes les
+    # SUMMARY_FLUSH_EVERY erreurs ou SUMMARY_FLUSH_INTERVAL secondes (et à la sortie du processus).
+    # Plusieurs processus (analyses en processus de travail) partagent le même fichier : chacun
+    # n'écrit que ses propres compteurs, ajoutés sous verrou au résumé relu sur disque.
+    SUMMARY_FLUSH_EVERY = 50
+    SUMMARY_FLUSH_INTERVAL = 5.0
+    
+    # Les entrées du journal sont écrites par blocs (64 Ko ou 100 entrées)
+    LOG_FLUSH_BYTES = 64 * 1024
+    LOG_FLUSH_ENTRIES = 100
+    
+    # Mots-clés du message d'erreur par catégorie, dans l'ordre de priorité
+    ERROR_KEYWORDS = (
+        ("permissions", ("permission", "accès refusé", "denied")),
+        ("file_access", ("not found", "does not exist", "no such file", "introuvable")),
+        ("file_read", ("read", "open", "load", "lecture")),
+        ("file_format", ("format", "invalid", "corrupt", "broken", "damaged")),
+        ("network", ("network", "connection", "timeout", "réseau", "connexion")),
+    )
+    _KEYWORD_CATEGORY = {keyword: category for category, keywords in ERROR_KEYWORDS for keyword in keywords}
+    _CATEGORY_PRIORITY = {category: rank for rank, (category, _) in enumerate(ERROR_KEYWORDS)}
+    # Une seule passe sur le message ; le lookahead relève aussi les mots-clés qui se chevauchent
+    _KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_CATEGORY)) + "))")
+    
     def __init__(self, log_dir="logs"):
         self.log_dir = log_dir
         if not os.path.exists(log_dir):
@@ -31,54 +75,148 @@ class ErrorHandler:
             "other": "Autres erreurs"
         }
         
-        # Initialiser ou charger le résumé des erreurs
+        # Tampon des lignes JSON (encodées) du journal en attente d'écriture
+        self._log_lock = threading.Lock()
+        self._log_buffer = []
+        self._log_buffer_bytes = 0
+        
+        # Compteurs du résumé des erreurs
+        self._summary_lock = threading.Lock()
         self._init_error_summary()
+        atexit.register(self._flush_at_exit)
     
     def _init_error_summary(self):
-        """Initialise ou charge le résumé des erreurs."""
-        if not os.path.exists(self.summary_file):
-            summary = {
-                "total_errors": 0,
-                "categories": {cat: 0 for cat in self.error_categories.keys()},
-                "most_common_errors": {},
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            with open(self.summary_file, "w", encoding="utf-8") as f:
-                json.dump(summary, f, indent=4)
+        """
+        Prépare les compteurs en attente de ce processus. Le résumé lui-même n'est lu que sur
+        disque : le fichier n'est créé qu'à la première écriture d'une erreur.
+        """
+        self._summary_dirty = 0
+        self._summary_last_flush = time.monotonic()
+        # Compteurs de ce processus pas encore reportés dans le fichier
+        self._summary_pending = self._new_summary_counts()
     
-    def _update_error_summary(self, category, error_type, error_message):
-        """Met à jour le résumé des erreurs."""
-        try:
-            # Charger le résumé actuel
-            with open(self.summary_file, "r", encoding="utf-8") as f:
-                summary = json.load(f)
-            
-            # Mettre à jour les compteurs
-            summary["total_errors"] += 1
-            summary["categories"][category] = summary["categories"].get(category, 0) + 1
-            
-            # Mettre à jour les erreurs les plus courantes
-            error_key = f"{error_type}: {error_message[:50]}"  # Tronquer les messages trop longs
-            summary["most_common_errors"][error_key] = summary["most_common_errors"].get(error_key, 0) + 1
-            
-            # Limiter aux 10 erreurs les plus courantes
-            summary["most_common_errors"] = dict(sorted(
-                summary["most_common_errors"].items(), 
-                key=lambda item: item[1], 
-                reverse=True
-            )[:10])
-            
-            # Mettre à jour la date
+    def _new_summary(self):
+        return {
+            "total_errors": 0,
+            "categories": {cat: 0 for cat in self.error_categories.keys()},
+            "most_common_errors": {},
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
+    @staticmethod
+    def _new_summary_counts():
+        return {"total_errors": 0, "categories": {}, "most_common_errors": {}}
+    
+    def _read_summary_file(self):
+        """Résumé enregistré sur disque (résumé vide s'il est absent ou illisible)."""
+        if os.path.exists(self.summary_file):
+            try:
+                with open(self.summary_file, "rb") as f:
+                    return orjson.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.error("Erreur lors de la lecture du résumé des erreurs: %s", e)
+        return self._new_summary()
+    
+    def _write_summary(self):
+        """
+        Ajoute les compteurs en attente au résumé relu sur disque, puis l'écrit via un fichier
+        temporaire remplacé atomiquement (verrou de thread pris par l'appelant).
+        
+        Returns:
+            dict: Résumé écrit
+        """
+        # Verrou entre processus : la relecture et l'écriture ne doivent pas s'entrelacer
+        with file_lock(self.summary_file + ".lock"):
+            summary = self._read_summary_file()
+            pending = self._summary_pending
+            summary["total_errors"] = summary.get("total_errors", 0) + pending["total_errors"]
+            categories = summary.setdefault("categories", {})
+            for category, count in pending["categories"].items():
+                categories[category] = categories.get(category, 0) + count
+            most_common = summary.get("most_common_errors", {})
+            for error_key, count in pending["most_common_errors"].items():
+                most_common[error_key] = most_common.get(error_key, 0) + count
+            summary["most_common_errors"] = dict(heapq.nlargest(10, most_common.items(), key=operator.itemgetter(1)))
             summary["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Sauvegarder le résumé mis à jour
-            with open(self.summary_file, "w", encoding="utf-8") as f:
-                json.dump(summary, f, indent=4)
-                
+            # Point de contrôle : le contenu est sur disque avant de remplacer l'ancien résumé
+            atomic_write_bytes(self.summary_file, orjson.dumps(summary), sync=True)
+        
+        self._summary_pending = self._new_summary_counts()
+        self._summary_dirty = 0
+        self._summary_last_flush = time.monotonic()
+        return summary
+    
+    def _flush_summary(self):
+        """Écrit le résumé s'il a changé depuis la dernière écriture."""
+        try:
+            with self._summary_lock:
+                if self._summary_dirty:
+                    self._write_summary()
         except Exception as e:
-            logging.error(f"Erreur lors de la mise à jour du résumé des erreurs: {str(e)}")
+            logger.error("Erreur lors de l'écriture du résumé des erreurs: %s", e)
+    
+    def _flush_at_exit(self):
+        """
+        À la sortie du processus : écrit le journal et les compteurs en attente. Sans rien en
+        attente, aucun fichier n'est touché (ni le dossier des journaux recréé).
+        """
+        if self._log_buffer:
+            self._flush_log_buffer()
+        if self._summary_dirty:
+            self._flush_summary()
+    
+    def _update_error_summary(self, category, error_type, error_message):
+        """Met à jour les compteurs en attente, puis les écrit dans le résumé si nécessaire."""
+        try:
+            with self._summary_lock:
+                self._update_summary_counts(self._summary_pending, category, error_type, error_message)
+                self._summary_dirty += 1
+                if (self._summary_dirty >= self.SUMMARY_FLUSH_EVERY
+                        or time.monotonic() - self._summary_last_flush > self.SUMMARY_FLUSH_INTERVAL):
+                    self._write_summary()
+        except Exception as e:
+            logger.error("Erreur lors de la mise à jour du résumé des erreurs: %s", e)
+    
+    @staticmethod
+    def _update_summary_counts(summary, category, error_type, error_message):
+        """
+        Incrémente les compteurs en attente pour une erreur (toutes les erreurs sont gardées :
+        la limite aux 10 plus courantes est appliquée à l'écriture du résumé).
+        """
+        # Mettre à jour les compteurs
+        summary["total_errors"] += 1
+        summary["categories"][category] = summary["categories"].get(category, 0) + 1
+        
+        # Mettre à jour les erreurs les plus courantes
+        error_key = f"{error_type}: {error_message[:50]}"  # Tronquer les messages trop longs
+        summary["most_common_errors"][error_key] = summary["most_common_errors"].get(error_key, 0) + 1
+    
+    def _flush_log_buffer(self):
+        """Écrit en une fois les entrées du journal en attente."""
+        with self._log_lock:
+            if not self._log_buffer:
+                return
+            lines = self._log_buffer
+            self._log_buffer = []
+            self._log_buffer_bytes = 0
+            
+            try:
+                with open(self.error_log_file, "ab", buffering=0) as f:
+                    f.write(b"".join(lines))
+            except Exception as e:
+                logger.error("Erreur lors de l'écriture du journal des erreurs: %s", e)
+                # Repli ligne par ligne pour ne perdre que les entrées réellement impossibles à écrire
+                os.makedirs(self.log_dir, exist_ok=True)
+                for line in lines:
+                    try:
+                        with open(self.error_log_file, "ab") as f:
+                            f.write(line)
+                    except Exception:
+                        continue
     
-    def log_error(self, error, file_path=None, category="other", additional_info=None):
+    def log_error(self, error, file_path=None, category="other", additional_info=None,
+                  capture_traceback=True):
         """
         Enregistre une erreur dans le journal.
         
@@ -87,6 +225,8 @@ class ErrorHandler:
             file_path (str, optional): Le chemin du fichier concerné
             category (str, optional): La catégorie de l'erreur
             additional_info (dict, optional): Informations supplémentaires
+            capture_traceback (bool, optional): Joindre la pile de l'exception en cours de
+                traitement (False dans les boucles où elle n'est pas utile)
         """
         try:
             # Créer l'entrée d'erreur
@@ -94,32 +234,38 @@ class ErrorHandler:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "error_type": type(error).__name__,
                 "error_message": str(error),
-                "traceback": traceback.format_exc(),
                 "category": category,
                 "file_path": file_path
             }
             
+            # La pile n'est formatée que si une exception est effectivement en cours de traitement
+            if capture_traceback and sys.exc_info()[0] is not None:
+                error_entry["traceback"] = traceback.format_exc()
+            
             # Ajouter des informations supplémentaires si présentes
             if additional_info:
                 error_entry.update(additional_info)
             
-            # Enregistrer dans le fichier journal
-            try:
-                with open(self.error_log_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(error_entry) + "\n")
-            except FileNotFoundError:
-                with open(self.error_log_file, "w", encoding="utf-8") as f:
-                    f.write(json.dumps(error_entry) + "\n")
+            # Ajouter l'entrée au tampon du journal, écrit par blocs
+            line = orjson.dumps(error_entry, option=orjson.OPT_APPEND_NEWLINE)
+            with self._log_lock:
+                self._log_buffer.append(line)
+                self._log_buffer_bytes += len(line)
+                flush_needed = (self._log_buffer_bytes >= self.LOG_FLUSH_BYTES
+                                or len(self._log_buffer) >= self.LOG_FLUSH_ENTRIES)
+            if flush_needed:
+                self._flush_log_buffer()
             
             # Mettre à jour le résumé
             self._update_error_summary(category, error_entry["error_type"], error_entry["error_message"])
             
             # Enregistrer également dans le journal standard
-            logging.error(f"{category.upper()}: {error_entry['error_type']} - {error_entry['error_message']} - Fichier: {file_path}")
+            logger.error("%s: %s - %s - Fichier: %s", category.upper(), error_entry['error_type'],
+                         error_entry['error_message'], file_path)
             
         except Exception as e:
             # En cas d'erreur pendant le traitement, utiliser le logging standard
-            logging.error(f"Erreur lors de l'enregistrement de l'erreur: {str(e)}")
+            logger.error("Erreur lors de l'enregistrement de l'erreur: %s", e)
     
     def categorize_error(self, error, file_path=None):
         """
@@ -132,34 +278,23 @@ class ErrorHandler:
         Returns:
             str: La catégorie de l'erreur
         """
-        error_str = str(error).lower()
-        error_type = type(error).__name__
-        
         # Vérifier par type d'erreur
-        if error_type in ["FileNotFoundError", "NotADirectoryError"]:
+        if isinstance(error, _FILE_ACCESS_EXCS):
             return "file_access"
         
-        if error_type in ["PermissionError", "AccessDenied"]:
+        # AccessDenied (psutil) n'est pas importé : reconnu par son nom
+        if isinstance(error, _PERM_EXCS) or type(error).__name__ == "AccessDenied":
             return "permissions"
         
-        if error_type in ["MemoryError", "OverflowError"]:
+        if isinstance(error, _MEM_EXCS):
             return "memory"
         
-        # Vérifier par contenu du message d'erreur
-        if any(term in error_str for term in ["permission", "accès refusé", "denied"]):
-            return "permissions"
-            
-        if any(term in error_str for term in ["not found", "does not exist", "no such file", "introuvable"]):
-            return "file_access"
-            
-        if any(term in error_str for term in ["read", "open", "load", "lecture"]):
-            return "file_read"
-            
-        if any(term in error_str for term in ["format", "invalid", "corrupt", "broken", "damaged"]):
-            return "file_format"
-            
-        if any(term in error_str for term in ["network", "connection", "timeout", "réseau", "connexion"]):
-            return "network"
+        error_str = str(error).lower()
+        
+        # Vérifier par contenu du message d'erreur (catégorie la plus prioritaire trouvée)
+        categories = {self._KEYWORD_CATEGORY[keyword] for keyword in self._KEYWORD_RE.findall(error_str)}
+        if categories:
+            return min(categories, key=self._CATEGORY_PRIORITY.__getitem__)
         
         # Par défaut
         return "other"
@@ -172,10 +307,14 @@ class ErrorHandler:
             dict: Résumé des erreurs
         """
         try:
-            with open(self.summary_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # Le résumé sur disque réunit les compteurs de tous les processus (processus de
+            # travail, autres sessions) : ceux de ce processus y sont d'abord ajoutés sous verrou
+            with self._summary_lock:
+                if self._summary_dirty:
+                    return self._write_summary()
+                return self._read_summary_file()
         except Exception as e:
-            logging.error(f"Erreur lors de la lecture du résumé des erreurs: {str(e)}")
+            logger.error("Erreur lors de la lecture du résumé des erreurs: %s", e)
             return {
                 "total_errors": 0,
                 "categories": {cat: 0 for cat in self.error_categories.keys()},
@@ -194,12 +333,15 @@ class ErrorHandler:
             list: Liste des erreurs récentes
         """
         try:
+            # Les entrées encore en mémoire doivent figurer dans le résultat
+            self._flush_log_buffer()
+            
             recent_errors = []
             if os.path.exists(self.error_log_file):
-                with open(self.error_log_file, "r", encoding="utf-8") as f:
+                with open(self.error_log_file, "rb") as f:
                     for line in f:
                         try:
-                            error = json.loads(line.strip())
+                            error = orjson.loads(line)
                             recent_errors.append(error)
                         except:
                             continue
@@ -209,7 +351,7 @@ class ErrorHandler:
             return recent_errors[:limit]
             
         except Exception as e:
-            logging.error(f"Erreur lors de la récupération des erreurs récentes: {str(e)}")
+            logger.error("Erreur lors de la récupération des erreurs récentes: %s", e)
             return []
 
 # Instance globale du gestionnaire d'erreurs
@@ -226,14 +368,19 @@ def handle_error(func):
     Returns:
         wrapper: La fonction décorée
     """
+    # Valeur par défaut adaptée au type de retour attendu, déterminée une fois pour toutes
+    default = "" if func.__name__ in _EMPTY_STR_FNS else None
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
             # Déterminer le chemin du fichier s'il est présent dans les arguments
+            # (premier argument texte contenant un séparateur, sans accès au disque)
             file_path = None
             for arg in args:
-                if isinstance(arg, str) and os.path.exists(arg):
+                if isinstance(arg, str) and (os.sep in arg or '/' in arg):
                     file_path = arg
                     break
             
@@ -241,13 +388,6 @@ def handle_error(func):
             category = error_handler.categorize_error(e, file_path)
             error_handler.log_error(e, file_path, category)
             
-            # Renvoyer une valeur par défaut adaptée au type de retour attendu
-            if func.__name__ == "read_txt_file" or func.__name__ == "read_docx_file" or \
-               func.__name__ == "read_excel_file" or func.__name__ == "read_pdf_file":
-                return ""
-            elif func.__name__ == "analyze_file":
-                return None
-            else:
-                return None
+            return default
     
     return wrapper
@@ -1,9 +1,28 @@
 # analyzer/file_utils.py
 import os
+import stat
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 import re
 
+logger = logging.getLogger(__name__)
+
+# Verrouillage de fichier entre processus : fcntl (Unix) ou msvcrt (Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Motifs des fichiers temporaires courants, réunis en une seule expression compilée
+# (appliquée au chemin complet, comme auparavant motif par motif) :
+#   .tmp (Windows), .bak (sauvegardes), .swp (Vim), .temp, ~ en fin de nom (sauvegardes),
+#   .# en début de chemin (certains fichiers Unix), .part (téléchargements partiels), _temp
+TEMP_FILE_REGEX = re.compile(r'(?:\.(?:tmp|bak|swp|temp|part)|~)$|^\.#|_temp', re.IGNORECASE)
+
 def is_temp_file(file_path: str) -> bool:
     """
     Détecte si un fichier est un fichier temporaire ou de verrouillage 
@@ -14,83 +33,182 @@ def is_temp_file(file_path: str) -> bool:
         return True
     
     # Fichiers temporaires courants
-    temp_patterns = [
-        r'\.tmp$',          # Fichiers temporaires Windows
-        r'\.bak$',          # Fichiers de sauvegarde
-        r'\.swp$',          # Fichiers temporaires de Vim
-        r'\.temp$',         # Autres fichiers temporaires
-        r'~$',              # Fichiers de sauvegarde avec ~ à la fin
-        r'^\.#',            # Certains fichiers temporaires sur Unix
-        r'\.part$',         # Fichiers de téléchargement partiels
-        r'_temp',           # Fichiers avec "_temp" dans le nom
-    ]
-    
-    for pattern in temp_patterns:
-        if re.search(pattern, file_path, re.IGNORECASE):
-            return True
-    
-    return False
+    return TEMP_FILE_REGEX.search(file_path) is not None
 
-def should_skip_file(file_path: str, excluded_extensions: list = None) -> bool:
+def _path_and_stat(entry_or_path):
     """
-    Détermine si un fichier doit être ignoré basé sur son extension ou s'il est temporaire.
+    Chemin et fonction d'accès au stat d'un chemin ou d'une entrée os.scandir.
+    Le stat d'un DirEntry est mis en cache par os.scandir (souvent sans appel système).
     """
-    if is_temp_file(file_path):
-        logging.info(f"Ignoring temporary file: {file_path}")
-        return True
-        
+    if isinstance(entry_or_path, os.DirEntry):
+        return entry_or_path.path, entry_or_path.stat
+    return entry_or_path, lambda: os.stat(entry_or_path)
+
+def _skipped_by_name(file_path: str, excluded_extensions) -> bool:
+    """Tests de should_skip_file fondés sur le seul nom (extension exclue, fichier caché ou temporaire)."""
     if excluded_extensions:
         file_ext = Path(file_path).suffix.lower()
         if file_ext in excluded_extensions:
-            logging.info(f"Ignoring excluded extension {file_ext}: {file_path}")
+            logger.info("Ignoring excluded extension %s: %s", file_ext, file_path)
             return True
     
     # Vérifier les noms de fichiers qui commencent par un point (fichiers cachés)
     if os.path.basename(file_path).startswith('.'):
-        logging.info(f"Ignoring hidden file: {file_path}")
+        logger.info("Ignoring hidden file: %s", file_path)
         return True
     
-    # Vérifier si le fichier est trop volumineux (> 50 Mo)
+    if is_temp_file(file_path):
+        logger.info("Ignoring temporary file: %s", file_path)
+        return True
+    
+    return False
+
+def _stat_or_error(entry_or_path):
+    """Résultat du stat d'un chemin ou d'un DirEntry, ou l'OSError levée."""
     try:
-        if os.path.getsize(file_path) > 50 * 1024 * 1024:  # 50 Mo
-            logging.warning(f"Skipping large file (>50MB): {file_path}")
-            return True
+        return _path_and_stat(entry_or_path)[1]()
     except OSError as e:
-        logging.warning(f"Could not check size of {file_path}: {str(e)}")
+        return e
+
+def _skipped_by_size(file_path: str, file_stat) -> bool:
+    """Test de taille de should_skip_file, à partir d'un résultat de _stat_or_error."""
+    if isinstance(file_stat, OSError):
+        logger.warning("Could not check size of %s: %s", file_path, file_stat)
         return True
-        
+    
+    # Vérifier si le fichier est trop volumineux (> 50 Mo)
+    if file_stat.st_size > 50 * 1024 * 1024:  # 50 Mo
+        logger.warning("Skipping large file (>50MB): %s", file_path)
+        return True
+    
     return False
 
-def ensure_readable(file_path: str) -> bool:
+def _as_extension_set(excluded_extensions):
+    """Extensions exclues sous forme d'ensemble (test d'appartenance en temps constant)."""
+    if excluded_extensions and not isinstance(excluded_extensions, (set, frozenset)):
+        return frozenset(excluded_extensions)
+    return excluded_extensions
+
+def should_skip_file(entry_or_path, excluded_extensions=None) -> bool:
+    """
+    Détermine si un fichier doit être ignoré basé sur son extension ou s'il est temporaire.
+    
+    Accepte un chemin ou, de préférence lors du parcours d'un répertoire, l'os.DirEntry
+    fourni par os.scandir (dont le stat est déjà en cache). Les tests sur le nom sont
+    faits en premier : le stat n'est effectué que pour les fichiers qui les passent.
+    Pour un appel par fichier, passer excluded_extensions sous forme de frozenset.
+    """
+    file_path = _path_and_stat(entry_or_path)[0]
+    if _skipped_by_name(file_path, _as_extension_set(excluded_extensions)):
+        return True
+    return _skipped_by_size(file_path, _stat_or_error(entry_or_path))
+
+# Nombre maximal de stat simultanés dans filter_files
+FILTER_STAT_WORKERS = 16
+
+def filter_files(paths, excluded_extensions=None) -> list:
+    """
+    Applique should_skip_file à une liste de fichiers et retourne ceux à analyser, dans l'ordre.
+    
+    Les tests sur le nom sont faits d'abord ; les stat des fichiers restants sont lancés
+    en parallèle, ce qui masque la latence de chaque appel sur un partage réseau.
+    """
+    excluded_extensions = _as_extension_set(excluded_extensions)
+    candidates = [path for path in paths if not _skipped_by_name(path, excluded_extensions)]
+    
+    if len(candidates) > 1:
+        with ThreadPoolExecutor(max_workers=min(FILTER_STAT_WORKERS, len(candidates))) as executor:
+            stats = list(executor.map(_stat_or_error, candidates))
+    else:
+        stats = [_stat_or_error(path) for path in candidates]
+    
+    return [path for path, file_stat in zip(candidates, stats) if not _skipped_by_size(path, file_stat)]
+
+def ensure_readable(entry_or_path) -> bool:
     """
     Vérifie si un fichier est lisible et accessible.
+    
+    Existence, type et taille sont tirés d'un seul stat ; accepte un chemin ou un os.DirEntry.
     """
+    file_path, get_stat = _path_and_stat(entry_or_path)
     try:
         # Vérifier que le fichier existe
-        if not os.path.exists(file_path):
-            logging.warning(f"File does not exist: {file_path}")
+        try:
+            file_stat = get_stat()
+        except OSError:
+            logger.warning("File does not exist: %s", file_path)
             return False
             
         # Vérifier que c'est un fichier (et non un dossier)
-        if not os.path.isfile(file_path):
-            logging.warning(f"Not a file: {file_path}")
+        if not stat.S_ISREG(file_stat.st_mode):
+            logger.warning("Not a file: %s", file_path)
             return False
             
         # Vérifier que le fichier est accessible en lecture
         if not os.access(file_path, os.R_OK):
-            logging.warning(f"File not readable: {file_path}")
+            logger.warning("File not readable: %s", file_path)
             return False
             
         # Vérifier que le fichier n'est pas vide
-        if os.path.getsize(file_path) == 0:
-            logging.warning(f"File is empty: {file_path}")
+        if file_stat.st_size == 0:
+            logger.warning("File is empty: %s", file_path)
             return False
             
         return True
     except Exception as e:
-        logging.warning(f"Error checking file {file_path}: {str(e)}")
+        logger.warning("Error checking file %s: %s", file_path, e)
         return False
 
+def atomic_write_bytes(file_path: str, data: bytes, sync: bool = False) -> None:
+    """
+    Écrit un fichier via un fichier temporaire remplacé atomiquement (os.replace) :
+    un lecteur voit l'ancien contenu ou le nouveau, jamais un fichier à moitié écrit.
+    
+    Args:
+        file_path (str): Fichier à écrire
+        data (bytes): Contenu complet
+        sync (bool): Forcer l'écriture sur disque (fsync) avant le remplacement
+    """
+    # Nom propre au processus et au thread : deux écrivains ne partagent jamais le même temporaire
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@contextmanager
+def file_lock(lock_path: str):
+    """
+    Verrou exclusif entre processus, tenu pendant le bloc `with` (attente bloquante).
+    Le fichier de verrou est créé au besoin et laissé en place.
+    
+    Args:
+        lock_path (str): Fichier servant de verrou
+    """
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 def fix_network_path(file_path: str) -> str:
     """
     Corrige les chemins réseau pour les rendre plus robustes.
@@ -103,6 +221,6 @@ def fix_network_path(file_path: str) -> str:
             robust_path = file_path.replace('\\', '/')
             return robust_path
         except Exception as e:
-            logging.warning(f"Failed to fix network path {file_path}: {str(e)}")
+            logger.warning("Failed to fix network path %s: %s", file_path, e)
     
     return file_path
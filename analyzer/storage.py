@@ -1,33 +1,317 @@
 import os
-import json
+import mmap
+import pickle
 import uuid
 import datetime
-import pandas as pd
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+
+from .file_utils import atomic_write_bytes, file_lock
+
+# Parquet (optionnel) : format colonnaire compressé, lecture possible d'une partie des colonnes
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+
+# Repli pickle : une colonne de chaînes dont moins de la moitié des valeurs sont distinctes
+# est enregistrée en catégorie (chaque chaîne n'est sérialisée qu'une fois), puis remise
+# dans son type d'origine à la lecture
+PICKLE_CATEGORY_RATIO = 0.5
+PICKLE_ENCODED_ATTR = "rgpd_encoded_columns"
+
+def _encode_repeated_strings(df):
+    """Copie de df avec les colonnes de chaînes répétitives en catégories (df si aucune)."""
+    import pandas as pd
+    
+    if not df.columns.is_unique:
+        return df
+    encoded = {}
+    for col in df.columns:
+        series = df[col]
+        if not pd.api.types.is_string_dtype(series.dtype) or series.empty or series.hasnans:
+            continue
+        # Chaînes uniquement : une catégorie fusionnerait 1 et True, None et NaN
+        if pd.api.types.infer_dtype(series, skipna=False) != "string":
+            continue
+        if series.nunique() < PICKLE_CATEGORY_RATIO * len(series):
+            encoded[col] = series.dtype
+    if not encoded:
+        return df
+    encoded_df = df.astype({col: "category" for col in encoded})
+    encoded_df.attrs = {**df.attrs, PICKLE_ENCODED_ATTR: encoded}
+    return encoded_df
+
+def _decode_repeated_strings(df):
+    """Remet dans leur type d'origine les colonnes encodées par _encode_repeated_strings."""
+    encoded = df.attrs.pop(PICKLE_ENCODED_ATTR, None)
+    if encoded:
+        df = df.astype(encoded)
+    return df
+
+def write_analysis_file(df, base_path):
+    """
+    Écrit un DataFrame d'analyse en Parquet (zstd), ou en pickle si pyarrow est absent
+    ou si une colonne n'est pas convertible.
+    
+    Args:
+        df (pd.DataFrame): Résultats à enregistrer
+        base_path (str): Chemin sans extension
+        
+    Returns:
+        str: Chemin du fichier écrit
+    """
+    if PARQUET_AVAILABLE:
+        file_path = f"{base_path}.parquet"
+        try:
+            df.to_parquet(file_path, engine="pyarrow", compression=PARQUET_COMPRESSION,
+                          compression_level=PARQUET_COMPRESSION_LEVEL)
+            return file_path
+        except Exception:
+            # Colonne de type mixte non convertible : on garde le format pickle
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    file_path = f"{base_path}.pkl"
+    # Protocole 5 (PEP 574) écrit directement dans le fichier, sans tampon intermédiaire
+    with open(file_path, "wb") as f:
+        pickle.dump(_encode_repeated_strings(df), f, protocol=5)
+    return file_path
+
+def read_analysis_file(file_path, columns=None):
+    """
+    Lit un fichier d'analyse (.parquet, ou .pkl pour les analyses plus anciennes).
+    
+    Args:
+        file_path (str): Chemin du fichier
+        columns (list): Colonnes à lire (toutes si None, absentes ignorées) ; seul le Parquet
+            évite de lire les autres
+    """
+    import pandas as pd
+    
+    if file_path.endswith(".parquet"):
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(file_path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(file_path, engine="pyarrow", columns=columns)
+    df = _decode_repeated_strings(pd.read_pickle(file_path))
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+def read_analysis_table(file_path, columns=None):
+    """
+    Lit un fichier d'analyse Parquet sous forme de table Arrow, sans son index d'origine
+    (destinée à être concaténée à d'autres, comme pd.concat(..., ignore_index=True)).
+    
+    Args:
+        file_path (str): Chemin du fichier .parquet
+        columns (list): Colonnes à lire (toutes si None, absentes ignorées)
+    """
+    import pyarrow.parquet as pq
+    
+    if columns is not None:
+        available = set(pq.read_schema(file_path).names)
+        columns = [col for col in columns if col in available]
+    table = pq.read_table(file_path, columns=columns)
+    index_columns = [col for col in table.column_names if col.startswith("__index_level_")]
+    return table.drop_columns(index_columns) if index_columns else table
+
+def concat_analysis_frames(frames):
+    """
+    Concatène des résultats lus par read_analysis_table (tables Arrow) ou read_analysis_file
+    (DataFrame), avec un nouvel index.
+    
+    Si toutes les entrées sont des tables Arrow, elles sont assemblées côté Arrow (colonnes
+    manquantes complétées par des valeurs nulles) puis converties une seule fois en DataFrame ;
+    sinon, ou si les types d'une même colonne sont incompatibles, on passe par pd.concat.
+    """
+    import pandas as pd
+    
+    if not any(isinstance(frame, pd.DataFrame) for frame in frames):
+        import pyarrow as pa
+        try:
+            combined = pa.concat_tables(frames, promote_options="default")
+            return combined.to_pandas().reset_index(drop=True)
+        except pa.ArrowException:
+            pass
+    
+    return pd.concat(
+        [frame if isinstance(frame, pd.DataFrame) else frame.to_pandas() for frame in frames],
+        ignore_index=True
+    )
+
+SENSITIVE_FOUND_COLUMNS = ["emails_found", "phones_found", "names_found", "secu_found",
+                           "siret_found", "postal_addresses_found", "ip_addresses_found"]
+
+def has_sensitive_data(df):
+    """
+    Indique si au moins une colonne « _found » contient une valeur.
+    
+    Calculé une seule fois à l'enregistrement (puis lu dans les métadonnées). Les colonnes
+    sont comparées une à une, avec arrêt à la première valeur trouvée : pour les chaînes
+    adossées à Arrow (type par défaut de pandas 3), la comparaison reste vectorisée côté
+    Arrow, sans conversion préalable en tableau d'objets Python.
+    """
+    for col in SENSITIVE_FOUND_COLUMNS:
+        if col in df.columns and (df[col] != "").any():
+            return True
+    return False
 
 class AnalysisStorage:
+    # Les métadonnées sont un journal en ajout seul (une ligne JSON par opération) :
+    #   {"op": "add", ...entrée}  ou  {"op": "del", "id": ...}
+    # Il est réécrit sous forme compacte quand il contient nettement plus de lignes que d'analyses.
+    # Ajouts et réécritures se font sous un verrou de fichier (sessions, threads et processus
+    # de travail partagent le même journal) ; la réécriture relit le journal sous ce verrou.
+    METADATA_LOG = "metadata.ndjson"
+    LEGACY_METADATA_FILE = "metadata.json"
+    COMPACT_MIN_RECORDS = 32
+    
+    # Métadonnées déjà lues, par fichier : {chemin: (signature, liste, index par id)}. Partagé entre
+    # instances (l'interface en recrée une à chaque rendu) et invalidé quand le fichier
+    # change (date de modification, taille).
+    _metadata_cache = {}
+    
     def __init__(self, storage_dir="saved_analyses"):
         self.storage_dir = storage_dir
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
-        self.metadata_file = os.path.join(self.storage_dir, "metadata.json")
+        self.metadata_file = os.path.join(self.storage_dir, self.METADATA_LOG)
+        self._metadata_key = os.path.abspath(self.metadata_file)
+        self.lock_file = self.metadata_file + ".lock"
         if not os.path.exists(self.metadata_file):
-            with open(self.metadata_file, "w", encoding="utf-8") as f:
-                json.dump([], f)
+            with file_lock(self.lock_file):
+                if not os.path.exists(self.metadata_file):
+                    self._save_metadata(self._read_legacy_metadata())
+    
+    def _read_legacy_metadata(self):
+        """Métadonnées de l'ancien format (metadata.json, liste de la plus récente à la plus ancienne)."""
+        legacy_file = os.path.join(self.storage_dir, self.LEGACY_METADATA_FILE)
+        try:
+            with open(legacy_file, "rb") as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return []
+    
+    def _metadata_signature(self):
+        file_stat = os.stat(self.metadata_file)
+        return file_stat.st_mtime_ns, file_stat.st_size
+    
+    def _cache_metadata(self, signature, metadata):
+        """Met en cache la liste des métadonnées et son index par identifiant."""
+        cached = (signature, metadata, {entry["id"]: entry for entry in metadata})
+        self._metadata_cache[self._metadata_key] = cached
+        return cached
+    
+    def _cached_metadata(self):
+        signature = self._metadata_signature()
+        cached = self._metadata_cache.get(self._metadata_key)
+        if cached is None or cached[0] != signature:
+            metadata, record_count = self._read_metadata_file()
+            if self._needs_compaction(metadata, record_count):
+                cached = self._compact_metadata()
+            else:
+                cached = self._cache_metadata(signature, metadata)
+        return cached
+    
+    def _needs_compaction(self, metadata, record_count):
+        return record_count >= self.COMPACT_MIN_RECORDS and record_count > 2 * len(metadata)
+    
+    def _compact_metadata(self):
+        """
+        Réécrit le journal sous forme compacte. Il est relu sous le verrou : une opération
+        ajoutée par un autre processus depuis la première lecture n'est pas perdue.
+        """
+        with file_lock(self.lock_file):
+            metadata, record_count = self._read_metadata_file()
+            if self._needs_compaction(metadata, record_count):
+                self._save_metadata(metadata)
+                return self._metadata_cache[self._metadata_key]
+            return self._cache_metadata(self._metadata_signature(), metadata)
     
     def _load_metadata(self):
-        with open(self.metadata_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # Copie de la liste : les appelants peuvent la modifier sans toucher au cache
+        return list(self._cached_metadata()[1])
+    
+    def _load_metadata_index(self):
+        """Index {id: entrée} des métadonnées (partagé avec le cache : à ne pas modifier)."""
+        return self._cached_metadata()[2]
+    
+    def _read_metadata_file(self):
+        """
+        Rejoue le journal des métadonnées, lu via une projection mémoire en lecture seule.
+        La projection est fermée avant de rendre la main : sous Windows, un fichier
+        projeté ne peut pas être remplacé lors du compactage.
+        
+        Returns:
+            tuple: (entrées de la plus récente à la plus ancienne, nombre de lignes du journal)
+        """
+        entries = {}
+        record_count = 0
+        with open(self.metadata_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return [], 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Ligne incomplète (écriture interrompue) : ignorée
+                        continue
+                    record_count += 1
+                    if record.pop("op", "add") == "del":
+                        entries.pop(record.get("id"), None)
+                    else:
+                        entries[record["id"]] = record
+        return list(reversed(entries.values())), record_count
     
     def _save_metadata(self, metadata):
-        with open(self.metadata_file, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=4)
+        """
+        Réécrit le journal sous forme compacte (une ligne « add » par analyse).
+        À appeler avec le verrou du journal (self.lock_file) tenu.
+        """
+        # Remplacement atomique : un lecteur ne voit jamais un journal à moitié écrit
+        atomic_write_bytes(self.metadata_file, b"".join(
+            orjson.dumps({"op": "add", **entry}, option=orjson.OPT_APPEND_NEWLINE)
+            for entry in reversed(metadata)
+        ), sync=True)
+        self._cache_metadata(self._metadata_signature(), list(metadata))
+    
+    def _append_metadata_record(self, record, metadata):
+        """
+        Ajoute une opération à la fin du journal.
+        
+        Args:
+            record (dict): Opération à écrire
+            metadata (list): Métadonnées résultantes, mises en cache si le journal
+                n'a pas été modifié entre-temps par un autre processus
+        """
+        data = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        cached = self._metadata_cache.get(self._metadata_key)
+        with file_lock(self.lock_file):
+            signature_before = self._metadata_signature()
+            with open(self.metadata_file, "a+b") as f:
+                # Après une écriture interrompue, repartir sur une nouvelle ligne
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+            signature = self._metadata_signature()
+        if (cached is not None and cached[0] == signature_before
+                and signature[1] == signature_before[1] + len(data)):
+            self._cache_metadata(signature, metadata)
+        else:
+            self._metadata_cache.pop(self._metadata_key, None)
     
     def save_analysis(self, df, name, source_path="", description=""):
         analysis_id = str(uuid.uuid4())
-        filename = f"analysis_{analysis_id}.pkl"
-        file_path = os.path.join(self.storage_dir, filename)
-        df.to_pickle(file_path)
+        file_path = write_analysis_file(df, os.path.join(self.storage_dir, f"analysis_{analysis_id}"))
         
         metadata = self._load_metadata()
         new_entry = {
@@ -35,67 +319,99 @@ class AnalysisStorage:
             "name": name,
             "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "file_count": len(df),
-            "has_sensitive_data": any((df[col] != "").any() for col in ["emails_found", "phones_found", "names_found", "secu_found", "siret_found", "postal_addresses_found", "ip_addresses_found"]),
+            "has_sensitive_data": has_sensitive_data(df),
             "source_path": source_path,
             "description": description,
             "file_path": file_path
         }
         metadata.insert(0, new_entry)
-        self._save_metadata(metadata)
+        self._append_metadata_record({"op": "add", **new_entry}, metadata)
         return analysis_id
     
     def get_all_analyses_metadata(self):
         return self._load_metadata()
     
-    def get_analysis(self, analysis_id):
-        metadata = self._load_metadata()
-        entry = next((item for item in metadata if item["id"] == analysis_id), None)
+    def get_analysis(self, analysis_id, columns=None):
+        entry = self._load_metadata_index().get(analysis_id)
         if entry:
             try:
-                df = pd.read_pickle(entry["file_path"])
+                df = read_analysis_file(entry["file_path"], columns)
                 return df, entry
             except Exception as e:
                 return None, None
         return None, None
     
-    def concatenate_analyses(self, analysis_ids):
-        metadata = self._load_metadata()
+    @staticmethod
+    def _read_analysis_file(file_path, columns=None):
+        """
+        Lit un fichier d'analyse à concaténer (table Arrow pour le Parquet, DataFrame sinon) ;
+        None s'il est absent ou illisible.
+        """
+        try:
+            if file_path.endswith(".parquet"):
+                return read_analysis_table(file_path, columns)
+            return read_analysis_file(file_path, columns)
+        except Exception:
+            return None
+    
+    def concatenate_analyses(self, analysis_ids, columns=None):
+        entries_by_id = self._load_metadata_index()
+        entries = [entries_by_id[aid] for aid in analysis_ids if aid in entries_by_id]
+        if not entries:
+            return None, None
+        
+        # Lectures en parallèle : les accès disque (ou réseau) se recouvrent
+        with ThreadPoolExecutor(max_workers=min(8, len(entries))) as executor:
+            frames = list(executor.map(
+                self._read_analysis_file,
+                [entry["file_path"] for entry in entries],
+                [columns] * len(entries)
+            ))
+        
         dfs = []
         metadata_list = []
-        for aid in analysis_ids:
-            entry = next((item for item in metadata if item["id"] == aid), None)
-            if entry:
-                try:
-                    df = pd.read_pickle(entry["file_path"])
-                    dfs.append(df)
-                    metadata_list.append(entry)
-                except Exception as e:
-                    pass
+        for entry, df in zip(entries, frames):
+            if df is not None:
+                dfs.append(df)
+                metadata_list.append(entry)
         if dfs:
-            combined_df = pd.concat(dfs, ignore_index=True)
+            combined_df = concat_analysis_frames(dfs)
             return combined_df, metadata_list
         return None, None
     
     def delete_analysis(self, analysis_id):
-        metadata = self._load_metadata()
-        new_metadata = [item for item in metadata if item["id"] != analysis_id]
-        entry = next((item for item in metadata if item["id"] == analysis_id), None)
+        metadata, entries_by_id = self._cached_metadata()[1:]
+        entry = entries_by_id.get(analysis_id)
         if entry:
+            new_metadata = [item for item in metadata if item["id"] != analysis_id]
             try:
                 os.remove(entry["file_path"])
             except Exception as e:
                 pass
-            self._save_metadata(new_metadata)
+            self._append_metadata_record({"op": "del", "id": analysis_id}, new_metadata)
             return True
         return False
 
 def saved_analyses_tab():
+    # Dépendances de l'interface importées ici : AnalysisStorage seul (tâches en arrière-plan,
+    # processus de travail) n'a besoin ni de streamlit ni de pandas
+    import pandas as pd
+    import streamlit as st
+    import analyzer.core as analyzer
+    from analyzer.ui import show_statistics, show_risk_analysis, show_detailed_results
+    
+    def show_analysis(results_df):
+        show_statistics(results_df)
+        risk_analysis = analyzer.calculate_risk_scores(results_df)
+        show_risk_analysis(risk_analysis)
+        show_detailed_results(results_df)
+    
     st.markdown('<div class="sub-header">Analyses sauvegardées</div>', unsafe_allow_html=True)
     
     # Créer des onglets pour les analyses et les tâches en cours
     tab_names = ["📊 Analyses", "⏱️ Tâches en cours"]
     default_tab = 1 if "show_tasks_tab" in st.session_state and st.session_state.show_tasks_tab else 0
-    analyses_tab, tasks_tab = st.tabs(tab_names, index=default_tab)
+    analyses_tab, tasks_tab = st.tabs(tab_names, default=tab_names[default_tab])
     
     # Réinitialiser l'indicateur pour les futures visites
     if "show_tasks_tab" in st.session_state:
@@ -117,16 +433,18 @@ def saved_analyses_tab():
             st.markdown('<div class="powerbi-card">', unsafe_allow_html=True)
             st.markdown('<div class="card-header">ANALYSES DISPONIBLES</div>', unsafe_allow_html=True)
             
-            analyses_df = pd.DataFrame(all_analyses)
-            analyses_df['date_formatted'] = analyses_df['date'].apply(lambda x: x.replace('-', '/'))
-            analyses_df['action'] = ""
-            
-            display_df = analyses_df[['name', 'date_formatted', 'file_count', 'has_sensitive_data']].copy()
-            display_df.columns = ['Nom de l\'analyse', 'Date', 'Fichiers analysés', 'Données sensibles']
-            
-            display_df['Données sensibles'] = display_df['Données sensibles'].apply(lambda x: "✅ Oui" if x else "❌ Non")
+            # Lignes d'affichage construites directement depuis les métadonnées (sans DataFrame intermédiaire)
+            display_rows = [
+                {
+                    "Nom de l'analyse": a["name"],
+                    "Date": a["date"].replace('-', '/'),
+                    "Fichiers analysés": a["file_count"],
+                    "Données sensibles": "✅ Oui" if a["has_sensitive_data"] else "❌ Non",
+                }
+                for a in all_analyses
+            ]
             
-            st.dataframe(display_df, use_container_width=True)
+            st.dataframe(pd.DataFrame.from_records(display_rows), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Les onglets pour différentes actions
@@ -147,13 +465,7 @@ def saved_analyses_tab():
                             results_df, metadata = storage.get_analysis(selected_analysis)
                             if results_df is not None:
                                 st.success(f"✅ Analyse '{metadata['name']}' chargée avec succès!")
-                                # Vous pouvez ici ajouter l'affichage des statistiques et autres détails
-                                from app import show_statistics, show_risk_analysis, show_detailed_results
-                                import analyzer.core as analyzer
-                                show_statistics(results_df)
-                                risk_analysis = analyzer.calculate_risk_scores(results_df.to_dict('records'))
-                                show_risk_analysis(risk_analysis)
-                                show_detailed_results(results_df)
+                                show_analysis(results_df)
                             else:
                                 st.error("⚠️ Impossible de charger l'analyse. Les données semblent corrompues ou manquantes.")
             
@@ -171,12 +483,7 @@ def saved_analyses_tab():
                             combined_df, metadata_list = storage.concatenate_analyses(selected_analyses)
                             if combined_df is not None:
                                 st.success(f"✅ {len(metadata_list)} analyses combinées avec succès!")
-                                from app import show_statistics, show_risk_analysis, show_detailed_results
-                                import analyzer.core as analyzer
-                                show_statistics(combined_df)
-                                risk_analysis = analyzer.calculate_risk_scores(combined_df.to_dict('records'))
-                                show_risk_analysis(risk_analysis)
-                                show_detailed_results(combined_df)
+                                show_analysis(combined_df)
                             else:
                                 st.error("⚠️ Impossible de combiner les analyses. Certaines données peuvent être corrompues.")
                     elif selected_analyses:
@@ -262,13 +569,7 @@ def saved_analyses_tab():
                                         results_df, metadata = storage.get_analysis(analysis_id)
                                         if results_df is not None:
                                             st.success(f"✅ Analyse '{metadata['name']}' chargée avec succès!")
-                                            # Importer les fonctions d'affichage
-                                            from app import show_statistics, show_risk_analysis, show_detailed_results
-                                            import analyzer.core as analyzer
-                                            show_statistics(results_df)
-                                            risk_analysis = analyzer.calculate_risk_scores(results_df.to_dict('records'))
-                                            show_risk_analysis(risk_analysis)
-                                            show_detailed_results(results_df)
+                                            show_analysis(results_df)
                                         else:
                                             st.error("⚠️ Impossible de charger l'analyse. Les données semblent corrompues ou manquantes.")
                 
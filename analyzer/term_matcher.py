@@ -0,0 +1,48 @@
+# analyzer/term_matcher.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Automate d'Aho-Corasick (optionnel) : un seul parcours du texte pour toutes les listes de termes
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class TermMatcher:
+    """
+    Recherche simultanée d'une liste de sous-chaînes dans un texte.
+
+    Avec pyahocorasick, le texte est parcouru une seule fois quel que soit le nombre de
+    termes ; sans lui, on revient au test `term in text` terme par terme. Dans les deux
+    cas la recherche est sensible à la casse : le texte et les termes doivent déjà être
+    normalisés (en minuscules) par l'appelant.
+    """
+
+    def __init__(self, terms):
+        # Termes distincts, dans l'ordre d'origine
+        self.terms = tuple(dict.fromkeys(term for term in terms if term))
+        self._automaton = None
+
+        if ahocorasick is not None and self.terms:
+            automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                automaton.add_word(term, term)
+            automaton.make_automaton()
+            self._automaton = automaton
+            logger.debug("Automate Aho-Corasick construit (%s termes)", len(self.terms))
+
+    def find(self, text: str) -> set:
+        """Retourne l'ensemble des termes présents dans le texte."""
+        if self._automaton is None:
+            return {term for term in self.terms if term in text}
+        return {term for _, term in self._automaton.iter(text)}
+
+    def contains_any(self, text: str) -> bool:
+        """Indique si au moins un des termes est présent dans le texte."""
+        if self._automaton is None:
+            return any(term in text for term in self.terms)
+        for _ in self._automaton.iter(text):
+            return True
+        return False
@@ -0,0 +1,180 @@
+# analyzer/ui.py
+"""
+Composants d'affichage des résultats d'analyse, partagés par app.py et l'onglet des
+analyses sauvegardées (analyzer/storage.py) sans que ce dernier ait à importer app.
+"""
+from io import BytesIO
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+def show_statistics(results_df):
+    st.markdown('<div class="sub-header">Statistiques d\'analyse</div>', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Fichiers analysés", len(results_df))
+    with col2:
+        sensitive_mask = (
+            (results_df['emails_found'] != "") |
+            (results_df['phones_found'] != "") |
+            (results_df['names_found'] != "") |
+            (results_df['secu_found'] != "") |
+            (results_df['siret_found'] != "") |
+            (results_df.get('postal_addresses_found', "") != "") |
+            (results_df.get('ip_addresses_found', "") != "")
+        )
+        st.metric("Fichiers avec données personnelles", len(results_df[sensitive_mask]))
+    with col3:
+        st.metric("Types de fichiers", len(results_df['file_type'].unique()))
+        
+    # Graphique de répartition des types de données personnelles
+    st.markdown('<div class="sub-header">Répartition des données personnelles détectées</div>', unsafe_allow_html=True)
+    
+    # Calculer le nombre de fichiers contenant chaque type de données
+    data_types = {
+        'Emails': results_df['emails_found'].apply(lambda x: x != '').sum(),
+        'Téléphones': results_df['phones_found'].apply(lambda x: x != '').sum(),
+        'Noms': results_df['names_found'].apply(lambda x: x != '').sum(),
+        'Numéros Sécu.': results_df['secu_found'].apply(lambda x: x != '').sum(),
+        'SIRET': results_df['siret_found'].apply(lambda x: x != '').sum()
+    }
+    
+    # Ajouter les nouveaux types de données s'ils existent
+    if 'postal_addresses_found' in results_df.columns:
+        data_types['Adresses postales'] = results_df['postal_addresses_found'].apply(lambda x: x != '').sum()
+    if 'ip_addresses_found' in results_df.columns:
+        data_types['Adresses IP'] = results_df['ip_addresses_found'].apply(lambda x: x != '').sum()
+    
+    # Créer un DataFrame pour le graphique
+    data_types_df = pd.DataFrame({
+        'Type de données': list(data_types.keys()),
+        'Nombre de fichiers': list(data_types.values())
+    })
+    
+    # Trier par fréquence décroissante
+    data_types_df = data_types_df.sort_values('Nombre de fichiers', ascending=False)
+    
+    # Créer le graphique
+    fig1 = px.bar(data_types_df, 
+                x='Type de données', 
+                y='Nombre de fichiers', 
+                color='Nombre de fichiers',
+                color_continuous_scale=px.colors.sequential.Blues,
+                title='Types de données personnelles détectées')
+    
+    # Améliorer le style du graphique
+    fig1.update_layout(
+        xaxis_title='',
+        yaxis_title='Nombre de fichiers',
+        font=dict(size=12),
+        margin=dict(l=20, r=20, t=40, b=20),
+        plot_bgcolor='rgba(240, 247, 255, 0.5)'
+    )
+    
+    st.plotly_chart(fig1, use_container_width=True)
+    
+    # Ajouter un graphique camembert pour la proportion de fichiers avec données personnelles
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Répartition par type de fichier (graphique plus petit)
+        st.markdown('<div class="mini-header">Répartition par type de fichier</div>', unsafe_allow_html=True)
+        file_type_counts = results_df['file_type'].value_counts().reset_index()
+        file_type_counts.columns = ['Type de fichier', 'Nombre']
+        fig2 = px.bar(file_type_counts, x='Type de fichier', y='Nombre', color='Nombre', color_continuous_scale=px.colors.sequential.Blues)
+        fig2.update_layout(margin=dict(l=20, r=20, t=20, b=20), height=300)
+        st.plotly_chart(fig2, use_container_width=True)
+    
+    with col2:
+        # Proportions de fichiers avec/sans données personnelles
+        st.markdown('<div class="mini-header">Proportion de fichiers avec données personnelles</div>', unsafe_allow_html=True)
+        sensitive_count = len(results_df[results_df['emails_found'] != '']) + \
+                        len(results_df[results_df['phones_found'] != '']) + \
+                        len(results_df[results_df['names_found'] != '']) + \
+                        len(results_df[results_df['secu_found'] != '']) + \
+                        len(results_df[results_df['siret_found'] != ''])
+        
+        # Éviter le double comptage
+        sensitive_mask = (
+            (results_df['emails_found'] != '') |
+            (results_df['phones_found'] != '') |
+            (results_df['names_found'] != '') |
+            (results_df['secu_found'] != '') |
+            (results_df['siret_found'] != '')
+        )
+        
+        # Ajouter les colonnes de nouvelles données personnelles si elles existent
+        if 'postal_addresses_found' in results_df.columns:
+            sensitive_mask = sensitive_mask | (results_df['postal_addresses_found'] != '')
+        if 'ip_addresses_found' in results_df.columns:
+            sensitive_mask = sensitive_mask | (results_df['ip_addresses_found'] != '')
+            
+        sensitive_count = len(results_df[sensitive_mask])
+        non_sensitive_count = len(results_df) - sensitive_count
+        
+        fig3 = px.pie(
+            values=[sensitive_count, non_sensitive_count],
+            names=['Avec données personnelles', 'Sans données personnelles'],
+            color_discrete_sequence=px.colors.sequential.Blues[3:5],
+            hole=0.4
+        )
+        fig3.update_layout(margin=dict(l=20, r=20, t=20, b=20), height=300)
+        fig3.update_traces(textposition='inside', textinfo='percent+label')
+        st.plotly_chart(fig3, use_container_width=True)
+
+def show_detailed_results(results_df):
+    st.markdown('<div class="sub-header">Résultats détaillés</div>', unsafe_allow_html=True)
+    with st.expander("Filtres", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_types = st.multiselect("Filtrer par type de fichier", options=sorted(results_df['file_type'].unique()), default=sorted(results_df['file_type'].unique()))
+        with col2:
+            data_filter = st.multiselect("Filtrer par type de données", 
+                                         options=["Emails", "Téléphones", "Noms", "Numéros Sécurité Sociale", "SIRET", "Adresses postales", "Adresses IP"],
+                                         default=["Emails", "Téléphones", "Noms", "Numéros Sécurité Sociale", "SIRET", "Adresses postales", "Adresses IP"])
+    filtered_df = results_df[results_df['file_type'].isin(selected_types)]
+    filter_conditions = []
+    if "Emails" in data_filter:
+        filter_conditions.append(filtered_df['emails_found'] != "")
+    if "Téléphones" in data_filter:
+        filter_conditions.append(filtered_df['phones_found'] != "")
+    if "Noms" in data_filter:
+        filter_conditions.append(filtered_df['names_found'] != "")
+    if "Numéros Sécurité Sociale" in data_filter:
+        filter_conditions.append(filtered_df['secu_found'] != "")
+    if "SIRET" in data_filter:
+        filter_conditions.append(filtered_df['siret_found'] != "")
+    if "Adresses postales" in data_filter:
+        filter_conditions.append(filtered_df.get('postal_addresses_found', "") != "")
+    if "Adresses IP" in data_filter:
+        filter_conditions.append(filtered_df.get('ip_addresses_found', "") != "")
+    if filter_conditions:
+        combined_filter = filter_conditions[0]
+        for condition in filter_conditions[1:]:
+            combined_filter = combined_filter | condition
+        filtered_df = filtered_df[combined_filter]
+    st.dataframe(filtered_df[['file_path', 'file_type', 'emails_found', 'phones_found', 'names_found', 'secu_found', 'siret_found',
+                                'postal_addresses_found', 'ip_addresses_found']], use_container_width=True)
+    if not filtered_df.empty:
+        csv = filtered_df.to_csv(index=False)
+        st.download_button("Télécharger les résultats au format CSV", csv, "resultats_rgpd.csv", "text/csv", key='download-csv')
+        excel_buffer = BytesIO()
+        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+            filtered_df.to_excel(writer, sheet_name='Résultats', index=False)
+        excel_data = excel_buffer.getvalue()
+        st.download_button("Télécharger les résultats au format Excel", excel_data, "resultats_rgpd.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key='download-excel')
+
+def show_risk_analysis(risk_analysis):
+    st.markdown('<div class="sub-header">Synthèse des risques</div>', unsafe_allow_html=True)
+    risk_col1, risk_col2, risk_col3 = st.columns(3)
+    with risk_col1:
+        st.metric("Fichiers à risque élevé", risk_analysis["total_high_risk"])
+    with risk_col2:
+        st.metric("Fichiers à risque moyen", risk_analysis["total_medium_risk"])
+    with risk_col3:
+        st.metric("Fichiers à risque faible", risk_analysis["total_low_risk"])
+    if risk_analysis["high_risk_files"]:
+        st.markdown('<div class="sub-header">Fichiers à risque élevé</div>', unsafe_allow_html=True)
+        high_risk_df = pd.DataFrame(risk_analysis["high_risk_files"])
+        st.dataframe(high_risk_df, use_container_width=True)
@@ -1,16 +1,60 @@
 # analyzer/validators.py
 import re
+import socket
 from typing import Tuple
 import logging
 
+import numpy as np
+import pandas as pd
+
+from .term_matcher import TermMatcher
+
 # Module de configuration
 from config.exclusion_lists import EXCLUDED_PERSONS, ORGANIZATION_UNITS, PROFESSIONAL_CONTEXT, TEMPLATE_INDICATORS
 
+logger = logging.getLogger(__name__)
+
+# Listes utilisées pour chaque entité candidate, construites une seule fois
+EXCLUDED_PERSONS_LOWER = tuple(excluded.lower() for excluded in EXCLUDED_PERSONS)
+NAME_PREFIXES = ("m.", "mme", "dr", "prof", "monsieur", "madame", "docteur", "professeur")
+NAME_TITLES = ("m.", "mme.", "mr.", "dr.", "monsieur", "madame", "docteur", "prof.", "professeur")
+NAME_ORG_INDICATORS = ("service", "équipe", "groupe", "département", "direction", "pôle")
+# Termes recherchés dans la fenêtre autour d'un nom, en un seul parcours
+NAME_CONTEXT_MATCHER = TermMatcher((*PROFESSIONAL_CONTEXT, *NAME_TITLES, *TEMPLATE_INDICATORS))
+NAME_SPECIAL_CHARS_RE = re.compile(r'[\@\#\$\%\*\+\=\_\|\<\>\{\}\[\]\^\/\\]')
+
+# Expressions des validateurs, compilées une seule fois
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9][^@]*@[^@]+\.[^@]+$')
+PHONE_CLEAN_RE = re.compile(r'[\s.\-_()]')
+PHONE_FR_RE = re.compile(r'^0[1-9]\d{8}$')
+PHONE_INTL_RE = re.compile(r'^\+33[1-9]\d{8}$')
+PHONE_INTL_ZERO_RE = re.compile(r'^\+330[1-9]\d{7}$')
+PHONE_0033_RE = re.compile(r'^0033[1-9]\d{8}$')
+PHONE_0033_ZERO_RE = re.compile(r'^00330[1-9]\d{7}$')
+# Numéro de sécurité sociale : 13 chiffres, suivis ou non d'un chiffre de clé
+SECU_RE = re.compile(r'^([123]\d{12})(\d)?$')
+POSTAL_CODE_RE = re.compile(r'\b\d{5}\b')
+STREET_RE = re.compile(r'\b\d{1,4}\s*[,]?\s+[\w\s\-\'\À-ÿ]+')
+IPV4_RE = re.compile(r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$')
+
+# Séparateurs de date (/, - ou .) ramenés à « / » avant un simple split
+DATE_SEPARATORS = str.maketrans("-.", "//")
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Clé de Luhn : valeur de chaque chiffre ASCII selon son rang depuis la droite
+# (rang pair : chiffre inchangé ; rang impair : chiffre doublé, moins 9 au-delà de 9)
+LUHN_TABLE = (
+    {ord("0") + d: d for d in range(10)},
+    {ord("0") + d: 2 * d - 9 if 2 * d > 9 else 2 * d for d in range(10)},
+)
+LUHN_WEIGHTS_14 = np.array([1, 2] * 7, dtype=np.int64)[::-1]
+LUHN_DOUBLED = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.int64)
+
 def validate_email(email: str) -> bool:
     """Valide un email avec des règles plus strictes."""
     if not email or len(email) > 254:
         return False
-    if not re.match(r'^[a-zA-Z0-9][^@]*@[^@]+\.[^@]+$', email):
+    if not EMAIL_RE.match(email):
         return False
     
     # Exclure les emails de l'organisation
@@ -22,25 +66,25 @@ def validate_email(email: str) -> bool:
 def validate_phone(phone: str) -> bool:
     """Valide un numéro de téléphone français avec gestion des formats internationaux."""
     # Supprime les espaces et caractères de formatage
-    cleaned = re.sub(r'[\s.\-_()]', '', phone)
+    cleaned = PHONE_CLEAN_RE.sub('', phone)
     
     # Forme canonique française
     if cleaned.startswith('0') and len(cleaned) == 10:
-        return re.match(r'^0[1-9]\d{8}$', cleaned) is not None
+        return PHONE_FR_RE.match(cleaned) is not None
     
     # Format international +33
     elif cleaned.startswith('+33'):
         if len(cleaned) == 11:  # +33 suivi de 9 chiffres
-            return re.match(r'^\+33[1-9]\d{8}$', cleaned) is not None
+            return PHONE_INTL_RE.match(cleaned) is not None
         elif len(cleaned) == 12 and cleaned[3] == '0':  # +330 au lieu de +33
-            return re.match(r'^\+330[1-9]\d{7}$', cleaned) is not None
+            return PHONE_INTL_ZERO_RE.match(cleaned) is not None
     
     # Format 0033
     elif cleaned.startswith('0033'):
         if len(cleaned) == 12:  # 0033 suivi de 9 chiffres
-            return re.match(r'^0033[1-9]\d{8}$', cleaned) is not None
+            return PHONE_0033_RE.match(cleaned) is not None
         elif len(cleaned) == 13 and cleaned[4] == '0':  # 00330 au lieu de 0033
-            return re.match(r'^00330[1-9]\d{7}$', cleaned) is not None
+            return PHONE_0033_ZERO_RE.match(cleaned) is not None
     
     return False
 
@@ -50,17 +94,15 @@ def validate_date(date_str: str) -> bool:
         if not date_str:
             return False
         # Séparateur peut être /, - ou .
-        day, month, year = re.split(r'[/-.]', date_str)
+        day, month, year = date_str.translate(DATE_SEPARATORS).split("/")
         day, month, year = int(day), int(month), int(year)
         # Validations de base
         if not (1 <= month <= 12 and 1900 <= year <= 2025):
             return False
         # Validation des jours selon le mois
-        days_in_month = {
-            1: 31, 2: 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28,
-            3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31
-        }
-        return 1 <= day <= days_in_month[month]
+        if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            return 1 <= day <= 29
+        return 1 <= day <= DAYS_IN_MONTH[month - 1]
     except:
         return False
 
@@ -68,51 +110,111 @@ def validate_secu(secu: str) -> bool:
     """Valide un numéro de sécurité sociale français avec la clé de contrôle."""
     if not secu:
         return False
-        
-    # Vérifier la longueur et le format de base
-    base_pattern = r'^[123]\d{13}$'
-    if not re.match(base_pattern, secu):
-        # Si format incomplet (sans clé), vérifier le format de base
-        if re.match(r'^[123]\d{12}$', secu):
-            return True  # Accepter sans vérifier la clé si 13 chiffres seulement
-        return False
-        
-    try:
-        # Extraire les 13 premiers chiffres et la clé (2 derniers)
-        numero = int(secu[:13])
-        cle = int(secu[13:])
-        
-        # Calculer la clé attendue: 97 - (numero % 97)
-        cle_attendue = 97 - (numero % 97)
-        
-        return cle == cle_attendue
-    except:
+    
+    # Vérifier le format de base : le motif garantit des chiffres, int() ne peut pas échouer
+    match = SECU_RE.match(secu)
+    if match is None:
         return False
+    
+    numero, cle = match.groups()
+    if cle is None:
+        return True  # Accepter sans vérifier la clé si 13 chiffres seulement
+    
+    # Clé attendue : 97 - (numero % 97)
+    return int(cle) == 97 - int(numero) % 97
 
 def validate_siret(siret: str) -> bool:
     """Valide un numéro SIRET avec la clé de Luhn."""
-    if not siret or len(siret) != 14:
+    if not siret or len(siret) != 14 or not siret.isascii():
         return False
-        
-    try:
-        # Vérification avec la clé de Luhn
-        total = 0
-        for i, digit in enumerate(reversed(siret)):
-            n = int(digit)
-            if i % 2:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
-        return total % 10 == 0
-    except:
+    
+    digits = siret.encode("ascii")
+    if not digits.isdigit():
         return False
+    
+    # Vérification avec la clé de Luhn (table de correspondance, sans branchement par chiffre)
+    total = sum(LUHN_TABLE[i & 1][c] for i, c in enumerate(reversed(digits)))
+    return total % 10 == 0
 
-def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
+def validate_siret_batch(sirets) -> np.ndarray:
+    """
+    Valide un ensemble de numéros SIRET en une seule opération NumPy (clé de Luhn).
+    
+    Args:
+        sirets: Séquence (liste, tableau, Series) de chaînes
+        
+    Returns:
+        np.ndarray: Tableau de booléens, un par numéro (False si le format est invalide)
+    """
+    values = np.asarray(sirets, dtype=object)
+    result = np.zeros(len(values), dtype=bool)
+    well_formed = np.array([
+        isinstance(value, str) and len(value) == 14 and value.isascii() and value.isdigit()
+        for value in values
+    ], dtype=bool)
+    if not well_formed.any():
+        return result
+    
+    digits = np.frombuffer("".join(values[well_formed]).encode("ascii"), dtype=np.uint8)
+    digits = digits.reshape(-1, 14).astype(np.int64) - ord("0")
+    # Rangs impairs depuis la droite : chiffre doublé (moins 9 au-delà de 9)
+    contributions = np.where(LUHN_WEIGHTS_14 == 2, LUHN_DOUBLED[digits], digits)
+    result[well_formed] = contributions.sum(axis=1) % 10 == 0
+    return result
+
+# Variantes par colonne : une passe vectorisée (pandas / Arrow) au lieu d'un appel Python par ligne.
+# Les valeurs manquantes sont considérées comme invalides.
+
+def validate_email_series(emails: pd.Series) -> pd.Series:
+    """Équivalent de validate_email appliqué à toute une colonne."""
+    values = emails.astype("string")
+    lowered = values.str.lower()
+    valid = (
+        values.str.len().between(1, 254)
+        & values.str.match(EMAIL_RE.pattern)
+        & ~lowered.str.contains("@ogfa.", regex=False)
+        & ~lowered.str.contains("ogfa@", regex=False)
+    )
+    return valid.fillna(False).astype(bool)
+
+def validate_phone_series(phones: pd.Series) -> pd.Series:
+    """Équivalent de validate_phone appliqué à toute une colonne."""
+    cleaned = phones.astype("string").str.replace(PHONE_CLEAN_RE.pattern, "", regex=True)
+    length = cleaned.str.len()
+    
+    # Mêmes conditions de longueur que validate_phone, format par format
+    valid = (
+        ((length == 10) & cleaned.str.match(PHONE_FR_RE.pattern))
+        | ((length == 11) & cleaned.str.match(PHONE_INTL_RE.pattern))
+        | ((length == 12) & cleaned.str.match(PHONE_INTL_ZERO_RE.pattern))
+        | ((length == 12) & cleaned.str.match(PHONE_0033_RE.pattern))
+        | ((length == 13) & cleaned.str.match(PHONE_0033_ZERO_RE.pattern))
+    )
+    return valid.fillna(False).astype(bool)
+
+def validate_secu_series(secus: pd.Series) -> pd.Series:
+    """Équivalent de validate_secu appliqué à toute une colonne."""
+    parts = secus.astype("string").str.extract(SECU_RE.pattern)
+    numero = pd.to_numeric(parts[0]).to_numpy(dtype=np.float64, na_value=np.nan)
+    cle = pd.to_numeric(parts[1]).to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    matched = ~np.isnan(numero)
+    # 13 chiffres tiennent dans un float64 sans perte : le modulo reste exact
+    key_ok = np.isnan(cle) | (cle == 97 - np.fmod(np.nan_to_num(numero), 97))
+    return pd.Series(matched & key_ok, index=secus.index)
+
+def validate_siret_series(sirets: pd.Series) -> pd.Series:
+    """Équivalent de validate_siret appliqué à toute une colonne."""
+    return pd.Series(validate_siret_batch(sirets.to_numpy(dtype=object)), index=sirets.index)
+
+def validate_person_name(name: str, text: str, text_lower: str = None) -> Tuple[bool, float]:
     """
     Valide un nom de personne avec des règles strictes et retourne un score de confiance.
     Amélioré pour réduire les faux positifs et mieux comprendre le contexte.
     
+    text_lower (text en minuscules) peut être fourni par l'appelant qui valide plusieurs
+    noms du même texte, pour ne pas le recalculer à chaque nom.
+    
     Returns:
         Tuple[bool, float]: (Est valide, Score de confiance)
     """
@@ -124,7 +226,8 @@ def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
         return False, 0.0
     
     # Exclusion des noms de l'organisation
-    if any(excluded.lower() in name.lower() for excluded in EXCLUDED_PERSONS):
+    name_lower = name.lower()
+    if any(excluded in name_lower for excluded in EXCLUDED_PERSONS_LOWER):
         return False, 0.0
     
     # Détection des acronymes et acronymes d'entreprises
@@ -132,7 +235,7 @@ def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
         return False, 0.0
         
     # Exclure les noms avec caractères spéciaux typiques des entités non-humaines
-    if re.search(r'[\@\#\$\%\*\+\=\_\|\<\>\{\}\[\]\^\/\\]', name):
+    if NAME_SPECIAL_CHARS_RE.search(name):
         return False, 0.0
     
     # Doit contenir au moins deux mots (prénom et nom)
@@ -143,11 +246,11 @@ def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
         confidence += 0.1
     
     # Chaque mot doit commencer par une majuscule et ne pas contenir de chiffres
+    # (str.split() ne produit jamais de mot vide ; un mot entièrement alphabétique,
+    # le cas courant, ne peut pas contenir de chiffre : test en C sans parcours Python)
     capital_words = 0
     for word in words:
-        if not word:
-            continue
-        if word[0].isupper() and not any(char.isdigit() for char in word):
+        if word[0].isupper() and (word.isalpha() or not any(char.isdigit() for char in word)):
             capital_words += 1
             confidence += 0.05
         else:
@@ -158,23 +261,22 @@ def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
         confidence -= 0.2
     
     # Vérifier la fréquence dans le texte
-    occurrences = text.lower().count(name.lower())
+    if text_lower is None:
+        text_lower = text.lower()
+    occurrences = text_lower.count(name_lower)
     if occurrences > 3:
         confidence -= min(0.5, occurrences * 0.05)
     
     # Tester les préfixes et suffixes typiques des noms
-    name_lower = name.lower()
-    prefixes = ["m.", "mme", "dr", "prof", "monsieur", "madame", "docteur", "professeur"]
-    if any(name_lower.startswith(prefix) for prefix in prefixes):
+    if name_lower.startswith(NAME_PREFIXES):
         confidence += 0.15
         
     # Vérifier le contexte (est-ce dans un contexte professionnel?)
-    context_score = analyze_name_context(name, text)
+    context_score = analyze_name_context(name, text, text_lower)
     confidence -= context_score  # Réduit le score si contexte professionnel
     
     # Mots spécifiques aux organisations qui ne devraient pas être dans des noms de personnes
-    org_indicators = ["service", "équipe", "groupe", "département", "direction", "pôle"]
-    if any(indicator in name_lower for indicator in org_indicators):
+    if any(indicator in name_lower for indicator in NAME_ORG_INDICATORS):
         confidence -= 0.3
     
     # Validation finale basée sur le score de confiance
@@ -182,9 +284,10 @@ def validate_person_name(name: str, text: str) -> Tuple[bool, float]:
     
     return is_valid, min(1.0, max(0.0, confidence))
 
-def analyze_name_context(name: str, text: str) -> float:
+def analyze_name_context(name: str, text: str, text_lower: str = None) -> float:
     """
     Analyse le contexte autour d'un nom pour déterminer s'il s'agit d'un contexte professionnel.
+    text_lower (text en minuscules) est calculé s'il n'est pas fourni.
     
     Returns:
         float: Score de contexte professionnel (plus élevé = plus professionnel)
@@ -193,7 +296,9 @@ def analyze_name_context(name: str, text: str) -> float:
     
     try:
         # Rechercher le nom dans le texte
-        name_pos = text.lower().find(name.lower())
+        if text_lower is None:
+            text_lower = text.lower()
+        name_pos = text_lower.find(name.lower())
         if name_pos == -1:
             return 0.0
             
@@ -201,25 +306,24 @@ def analyze_name_context(name: str, text: str) -> float:
         start = max(0, name_pos - 100)
         end = min(len(text), name_pos + len(name) + 100)
         context = text[start:end].lower()
+        found_terms = NAME_CONTEXT_MATCHER.find(context)
         
         # Vérifier les termes professionnels dans le contexte
         for term in PROFESSIONAL_CONTEXT:
-            if term in context:
+            if term in found_terms:
                 context_score += 0.15
         
         # Vérifier si le nom est précédé ou suivi par un titre
-        titles = ["m.", "mme.", "mr.", "dr.", "monsieur", "madame", "docteur", "prof.", "professeur"]
-        name_parts = name.lower().split()
-        for title in titles:
-            if title in context:
+        for title in NAME_TITLES:
+            if title in found_terms:
                 context_score += 0.1
         
         # Vérifier si le texte contient des indicateurs de modèle/template
         for indicator in TEMPLATE_INDICATORS:
-            if indicator in context:
+            if indicator in found_terms:
                 context_score += 0.2
     except Exception as e:
-        logging.error(f"Erreur lors de l'analyse du contexte: {str(e)}")
+        logger.error("Erreur lors de l'analyse du contexte: %s", e)
     
     return min(1.0, context_score)
 
@@ -239,14 +343,15 @@ def validate_postal_address(address: str) -> bool:
     """
     if not address:
         return False
+    address = address.strip()
     
     # Vérifie la présence d'un code postal français (5 chiffres)
-    postal_code_match = re.search(r'\b\d{5}\b', address.strip())
+    postal_code_match = POSTAL_CODE_RE.search(address)
     if not postal_code_match:
         return False
     
     # Vérifie la présence d'un numéro de rue suivi d'un nom de rue
-    street_match = re.search(r'\b\d{1,4}\s*[,]?\s+[\w\s\-\'\À-ÿ]+', address.strip())
+    street_match = STREET_RE.search(address)
     if not street_match:
         return False
     
@@ -259,7 +364,8 @@ def validate_postal_address(address: str) -> bool:
 
 def validate_ip_address(ip: str) -> bool:
     """
-    Valide une adresse IPv4 ou IPv6 en utilisant des expressions régulières robustes.
+    Valide une adresse IPv4 (expression régulière) ou IPv6 (analyseur de la bibliothèque C,
+    socket.inet_pton).
     
     Exemples valides : 
     - IPv4: "192.168.1.1"
@@ -268,19 +374,20 @@ def validate_ip_address(ip: str) -> bool:
     if not ip:
         return False
     
+    ip = ip.strip()
+    
     # Validation IPv4
-    ipv4_pattern = re.compile(r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$')
-    if ipv4_pattern.match(ip.strip()):
+    if IPV4_RE.match(ip):
         return True
     
-    # Validation IPv6 (forme complète et abrégée)
-    ipv6_pattern = re.compile(r'^(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$|'
-                             r'^::(?:[0-9a-fA-F]{1,4}:){0,6}[0-9a-fA-F]{1,4}$|'
-                             r'^[0-9a-fA-F]{1,4}::(?:[0-9a-fA-F]{1,4}:){0,5}[0-9a-fA-F]{1,4}$|'
-                             r'^[0-9a-fA-F]{1,4}:[0-9a-fA-F]{1,4}::(?:[0-9a-fA-F]{1,4}:){0,4}[0-9a-fA-F]{1,4}$|'
-                             r'^(?:[0-9a-fA-F]{1,4}:){0,2}[0-9a-fA-F]{1,4}::(?:[0-9a-fA-F]{1,4}:){0,3}[0-9a-fA-F]{1,4}$|'
-                             r'^(?:[0-9a-fA-F]{1,4}:){0,3}[0-9a-fA-F]{1,4}::(?:[0-9a-fA-F]{1,4}:){0,2}[0-9a-fA-F]{1,4}$|'
-                             r'^(?:[0-9a-fA-F]{1,4}:){0,4}[0-9a-fA-F]{1,4}::(?:[0-9a-fA-F]{1,4}:)?[0-9a-fA-F]{1,4}$|'
-                             r'^(?:[0-9a-fA-F]{1,4}:){0,5}[0-9a-fA-F]{1,4}::[0-9a-fA-F]{1,4}$|'
-                             r'^(?:[0-9a-fA-F]{1,4}:){0,6}[0-9a-fA-F]{1,4}::$')
-    return bool(ipv6_pattern.match(ip.strip()))
\ No newline at end of file
+    # Validation IPv6 (forme complète, abrégée ou avec IPv4 intégrée). Rejet préalable sans
+    # exception des chaînes qui n'ont pas la structure d'une IPv6 : de 2 (« :: ») à 8
+    # deux-points (« 1:2:3:4:5:6:7:: »), un seul « :: »
+    colons = ip.count(":")
+    if colons < 2 or colons > 8 or ip.count("::") > 1:
+        return False
+    try:
+        socket.inet_pton(socket.AF_INET6, ip)
+    except (OSError, ValueError):
+        return False
+    return True
\ No newline at end of file
@@ -12,13 +12,12 @@ st.set_page_config(
 import pandas as pd
 import os
 import tempfile
-import plotly.express as px
 from pathlib import Path
 import sys
 import datetime
-from io import BytesIO
-from analyzer.storage import AnalysisStorage
+from analyzer.storage import AnalysisStorage, saved_analyses_tab
 from analyzer.background_task import BackgroundTask
+from analyzer.ui import show_statistics, show_risk_analysis, show_detailed_results
 
 # Import du gestionnaire d'erreurs
 from analyzer.error_handler import error_handler
@@ -115,271 +114,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def show_statistics(results_df):
-    st.markdown('<div class="sub-header">Statistiques d\'analyse</div>', unsafe_allow_html=True)
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Fichiers analysés", len(results_df))
-    with col2:
-        sensitive_mask = (
-            (results_df['emails_found'] != "") |
-            (results_df['phones_found'] != "") |
-            (results_df['names_found'] != "") |
-            (results_df['secu_found'] != "") |
-            (results_df['siret_found'] != "") |
-            (results_df.get('postal_addresses_found', "") != "") |
-            (results_df.get('ip_addresses_found', "") != "")
-        )
-        st.metric("Fichiers avec données personnelles", len(results_df[sensitive_mask]))
-    with col3:
-        st.metric("Types de fichiers", len(results_df['file_type'].unique()))
-        
-    # Graphique de répartition des types de données personnelles
-    st.markdown('<div class="sub-header">Répartition des données personnelles détectées</div>', unsafe_allow_html=True)
-    
-    # Calculer le nombre de fichiers contenant chaque type de données
-    data_types = {
-        'Emails': results_df['emails_found'].apply(lambda x: x != '').sum(),
-        'Téléphones': results_df['phones_found'].apply(lambda x: x != '').sum(),
-        'Noms': results_df['names_found'].apply(lambda x: x != '').sum(),
-        'Numéros Sécu.': results_df['secu_found'].apply(lambda x: x != '').sum(),
-        'SIRET': results_df['siret_found'].apply(lambda x: x != '').sum()
-    }
-    
-    # Ajouter les nouveaux types de données s'ils existent
-    if 'postal_addresses_found' in results_df.columns:
-        data_types['Adresses postales'] = results_df['postal_addresses_found'].apply(lambda x: x != '').sum()
-    if 'ip_addresses_found' in results_df.columns:
-        data_types['Adresses IP'] = results_df['ip_addresses_found'].apply(lambda x: x != '').sum()
-    
-    # Créer un DataFrame pour le graphique
-    data_types_df = pd.DataFrame({
-        'Type de données': list(data_types.keys()),
-        'Nombre de fichiers': list(data_types.values())
-    })
-    
-    # Trier par fréquence décroissante
-    data_types_df = data_types_df.sort_values('Nombre de fichiers', ascending=False)
-    
-    # Créer le graphique
-    fig1 = px.bar(data_types_df, 
-                x='Type de données', 
-                y='Nombre de fichiers', 
-                color='Nombre de fichiers',
-                color_continuous_scale=px.colors.sequential.Blues,
-                title='Types de données personnelles détectées')
-    
-    # Améliorer le style du graphique
-    fig1.update_layout(
-        xaxis_title='',
-        yaxis_title='Nombre de fichiers',
-        font=dict(size=12),
-        margin=dict(l=20, r=20, t=40, b=20),
-        plot_bgcolor='rgba(240, 247, 255, 0.5)'
-    )
-    
-    st.plotly_chart(fig1, use_container_width=True)
-    
-    # Ajouter un graphique camembert pour la proportion de fichiers avec données personnelles
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Répartition par type de fichier (graphique plus petit)
-        st.markdown('<div class="mini-header">Répartition par type de fichier</div>', unsafe_allow_html=True)
-        file_type_counts = results_df['file_type'].value_counts().reset_index()
-        file_type_counts.columns = ['Type de fichier', 'Nombre']
-        fig2 = px.bar(file_type_counts, x='Type de fichier', y='Nombre', color='Nombre', color_continuous_scale=px.colors.sequential.Blues)
-        fig2.update_layout(margin=dict(l=20, r=20, t=20, b=20), height=300)
-        st.plotly_chart(fig2, use_container_width=True)
-    
-    with col2:
-        # Proportions de fichiers avec/sans données personnelles
-        st.markdown('<div class="mini-header">Proportion de fichiers avec données personnelles</div>', unsafe_allow_html=True)
-        sensitive_count = len(results_df[results_df['emails_found'] != '']) + \
-                        len(results_df[results_df['phones_found'] != '']) + \
-                        len(results_df[results_df['names_found'] != '']) + \
-                        len(results_df[results_df['secu_found'] != '']) + \
-                        len(results_df[results_df['siret_found'] != ''])
-        
-        # Éviter le double comptage
-        sensitive_mask = (
-            (results_df['emails_found'] != '') |
-            (results_df['phones_found'] != '') |
-            (results_df['names_found'] != '') |
-            (results_df['secu_found'] != '') |
-            (results_df['siret_found'] != '')
-        )
-        
-        # Ajouter les colonnes de nouvelles données personnelles si elles existent
-        if 'postal_addresses_found' in results_df.columns:
-            sensitive_mask = sensitive_mask | (results_df['postal_addresses_found'] != '')
-        if 'ip_addresses_found' in results_df.columns:
-            sensitive_mask = sensitive_mask | (results_df['ip_addresses_found'] != '')
-            
-        sensitive_count = len(results_df[sensitive_mask])
-        non_sensitive_count = len(results_df) - sensitive_count
-        
-        fig3 = px.pie(
-            values=[sensitive_count, non_sensitive_count],
-            names=['Avec données personnelles', 'Sans données personnelles'],
-            color_discrete_sequence=px.colors.sequential.Blues[3:5],
-            hole=0.4
-        )
-        fig3.update_layout(margin=dict(l=20, r=20, t=20, b=20), height=300)
-        fig3.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig3, use_container_width=True)
-
-def show_detailed_results(results_df):
-    st.markdown('<div class="sub-header">Résultats détaillés</div>', unsafe_allow_html=True)
-    with st.expander("Filtres", expanded=True):
-        col1, col2 = st.columns(2)
-        with col1:
-            selected_types = st.multiselect("Filtrer par type de fichier", options=sorted(results_df['file_type'].unique()), default=sorted(results_df['file_type'].unique()))
-        with col2:
-            data_filter = st.multiselect("Filtrer par type de données", 
-                                         options=["Emails", "Téléphones", "Noms", "Numéros Sécurité Sociale", "SIRET", "Adresses postales", "Adresses IP"],
-                                         default=["Emails", "Téléphones", "Noms", "Numéros Sécurité Sociale", "SIRET", "Adresses postales", "Adresses IP"])
-    filtered_df = results_df[results_df['file_type'].isin(selected_types)]
-    filter_conditions = []
-    if "Emails" in data_filter:
-        filter_conditions.append(filtered_df['emails_found'] != "")
-    if "Téléphones" in data_filter:
-        filter_conditions.append(filtered_df['phones_found'] != "")
-    if "Noms" in data_filter:
-        filter_conditions.append(filtered_df['names_found'] != "")
-    if "Numéros Sécurité Sociale" in data_filter:
-        filter_conditions.append(filtered_df['secu_found'] != "")
-    if "SIRET" in data_filter:
-        filter_conditions.append(filtered_df['siret_found'] != "")
-    if "Adresses postales" in data_filter:
-        filter_conditions.append(filtered_df.get('postal_addresses_found', "") != "")
-    if "Adresses IP" in data_filter:
-        filter_conditions.append(filtered_df.get('ip_addresses_found', "") != "")
-    if filter_conditions:
-        combined_filter = filter_conditions[0]
-        for condition in filter_conditions[1:]:
-            combined_filter = combined_filter | condition
-        filtered_df = filtered_df[combined_filter]
-    st.dataframe(filtered_df[['file_path', 'file_type', 'emails_found', 'phones_found', 'names_found', 'secu_found', 'siret_found',
-                                'postal_addresses_found', 'ip_addresses_found']], use_container_width=True)
-    if not filtered_df.empty:
-        csv = filtered_df.to_csv(index=False)
-        st.download_button("Télécharger les résultats au format CSV", csv, "resultats_rgpd.csv", "text/csv", key='download-csv')
-        excel_buffer = BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            filtered_df.to_excel(writer, sheet_name='Résultats', index=False)
-        excel_data = excel_buffer.getvalue()
-        st.download_button("Télécharger les résultats au format Excel", excel_data, "resultats_rgpd.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key='download-excel')
-
-def show_risk_analysis(risk_analysis):
-    st.markdown('<div class="sub-header">Synthèse des risques</div>', unsafe_allow_html=True)
-    risk_col1, risk_col2, risk_col3 = st.columns(3)
-    with risk_col1:
-        st.metric("Fichiers à risque élevé", risk_analysis["total_high_risk"])
-    with risk_col2:
-        st.metric("Fichiers à risque moyen", risk_analysis["total_medium_risk"])
-    with risk_col3:
-        st.metric("Fichiers à risque faible", risk_analysis["total_low_risk"])
-    if risk_analysis["high_risk_files"]:
-        st.markdown('<div class="sub-header">Fichiers à risque élevé</div>', unsafe_allow_html=True)
-        high_risk_df = pd.DataFrame(risk_analysis["high_risk_files"])
-        st.dataframe(high_risk_df, use_container_width=True)
-
-def saved_analyses_tab():
-    st.markdown('<div class="sub-header">Analyses sauvegardées</div>', unsafe_allow_html=True)
-    
-    storage = AnalysisStorage()
-    
-    all_analyses = storage.get_all_analyses_metadata()
-    
-    if not all_analyses:
-        st.markdown('<div class="powerbi-card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-header">AUCUNE ANALYSE DISPONIBLE</div>', unsafe_allow_html=True)
-        st.info("Aucune analyse n'a été sauvegardée. Veuillez effectuer une analyse pour commencer.")
-        st.markdown('</div>', unsafe_allow_html=True)
-        return
-    
-    st.markdown('<div class="powerbi-card">', unsafe_allow_html=True)
-    st.markdown('<div class="card-header">ANALYSES DISPONIBLES</div>', unsafe_allow_html=True)
-    
-    analyses_df = pd.DataFrame(all_analyses)
-    analyses_df['date_formatted'] = analyses_df['date'].apply(lambda x: x.replace('-', '/'))
-    analyses_df['action'] = ""
-    
-    display_df = analyses_df[['name', 'date_formatted', 'file_count', 'has_sensitive_data']].copy()
-    display_df.columns = ['Nom de l\'analyse', 'Date', 'Fichiers analysés', 'Données sensibles']
-    
-    display_df['Données sensibles'] = display_df['Données sensibles'].apply(lambda x: "✅ Oui" if x else "❌ Non")
-    
-    st.dataframe(display_df, use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Les onglets pour différentes actions
-    tab1, tab2, tab3 = st.tabs(["📊 Visualiser", "🔄 Combiner", "🗑️ Supprimer"])
-    
-    with tab1:
-        analysis_options = {a["id"]: f"{a['name']} ({a['date']})" for a in all_analyses}
-        selected_analysis = st.selectbox(
-            "Sélectionnez une analyse à visualiser", 
-            options=list(analysis_options.keys()),
-            format_func=lambda x: analysis_options[x],
-            key="view_select"
-        )
-        
-        if st.button("📊 Visualiser cette analyse", key="view_button"):
-            if selected_analysis:
-                with st.spinner("Chargement de l'analyse..."):
-                    results_df, metadata = storage.get_analysis(selected_analysis)
-                    if results_df is not None:
-                        st.success(f"✅ Analyse '{metadata['name']}' chargée avec succès!")
-                        # Vous pouvez ici ajouter l'affichage des statistiques et autres détails
-                    else:
-                        st.error("⚠️ Impossible de charger l'analyse. Les données semblent corrompues ou manquantes.")
-    
-    with tab2:
-        selected_analyses = st.multiselect(
-            "Sélectionnez plusieurs analyses à combiner",
-            options=list(analysis_options.keys()),
-            format_func=lambda x: analysis_options[x],
-            key="combine_select"
-        )
-        
-        if st.button("🔄 Combiner les analyses sélectionnées", key="combine_button"):
-            if selected_analyses and len(selected_analyses) > 1:
-                with st.spinner("Combinaison des analyses en cours..."):
-                    combined_df, metadata_list = storage.concatenate_analyses(selected_analyses)
-                    if combined_df is not None:
-                        st.success(f"✅ {len(metadata_list)} analyses combinées avec succès!")
-                    else:
-                        st.error("⚠️ Impossible de combiner les analyses. Certaines données peuvent être corrompues.")
-            elif selected_analyses:
-                st.warning("⚠️ Veuillez sélectionner au moins deux analyses à combiner.")
-            else:
-                st.warning("⚠️ Aucune analyse sélectionnée.")
-    
-    with tab3:
-        delete_analysis = st.selectbox(
-            "Sélectionnez une analyse à supprimer", 
-            options=list(analysis_options.keys()),
-            format_func=lambda x: analysis_options[x],
-            key="delete_select"
-        )
-        
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            confirm_delete = st.checkbox("Confirmer", key="confirm_delete")
-        with col2:
-            if st.button("🗑️ Supprimer cette analyse", key="delete_button", 
-                       disabled=not confirm_delete,
-                       help="Confirmez d'abord en cochant la case"):
-                if delete_analysis:
-                    success = storage.delete_analysis(delete_analysis)
-                    if success:
-                        st.success("✅ Analyse supprimée avec succès!")
-                        st.rerun()
-                    else:
-                        st.error("⚠️ Erreur lors de la suppression de l'analyse.")
-
 def analyze_directory(directory_path, progress_bar=None, max_files=None, save_analysis=True, excluded_extensions=None):
     # Vérifier si nous devons exécuter l'analyse en arrière-plan ou de manière synchrone
     if progress_bar is None:
@@ -605,7 +339,7 @@ def main():
                 if results_df is not None:
                     st.success(f"Analyse : {metadata['name']} - effectuée le {metadata['date']}")
                     show_statistics(results_df)
-                    risk_analysis = analyzer.calculate_risk_scores(results_df.to_dict('records'))
+                    risk_analysis = analyzer.calculate_risk_scores(results_df)
                     show_risk_analysis(risk_analysis)
                     show_detailed_results(results_df)
                 else:
@@ -652,7 +386,7 @@ def main():
                         results_df, _ = analyze_directory(directory_path, progress_bar, max_file_count, save_analysis=save_option, excluded_extensions=excluded_exts)
                         if results_df is not None and not results_df.empty:
                             show_statistics(results_df)
-                            risk_analysis = analyzer.calculate_risk_scores(results_df.to_dict('records'))
+                            risk_analysis = analyzer.calculate_risk_scores(results_df)
                             show_risk_analysis(risk_analysis)
                             show_detailed_results(results_df)
             else:
@@ -685,7 +419,7 @@ def main():
                         results_df, _ = analyze_uploaded_files(uploaded_files, progress_bar, save_analysis=save_option)
                         if results_df is not None and not results_df.empty:
                             show_statistics(results_df)
-                            risk_analysis = analyzer.calculate_risk_scores(results_df.to_dict('records'))
+                            risk_analysis = analyzer.calculate_risk_scores(results_df)
                             show_risk_analysis(risk_analysis)
                             show_detailed_results(results_df)
     elif analysis_options == "Paramètres":
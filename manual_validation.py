@@ -6,7 +6,7 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
-from analyzer.core import read_txt_file, read_docx_file, read_pdf_file, read_excel_file, get_file_type
+from analyzer.core import read_txt_file, read_csv_file, read_docx_file, read_pdf_file, read_excel_file, get_file_type
 
 def extract_context(file_path, value, window_size=100):
     """
@@ -27,6 +27,8 @@ def extract_context(file_path, value, window_size=100):
         
         if file_type == 'text':
             content = read_txt_file(file_path)
+        elif file_type == 'csv':
+            content = read_csv_file(file_path)
         elif file_type == 'word':
             content = read_docx_file(file_path)
         elif file_type == 'pdf':
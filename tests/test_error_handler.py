@@ -0,0 +1,178 @@
+# tests/test_error_handler.py
+import os
+import sys
+import unittest
+import tempfile
+import multiprocessing
+from pathlib import Path
+from unittest import mock
+
+import orjson
+
+# Ajouter le répertoire parent au chemin pour permettre l'importation
+parent_dir = str(Path(__file__).resolve().parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from analyzer import error_handler as error_handler_module
+from analyzer.error_handler import ErrorHandler, handle_error
+
+
+def _log_errors_in_worker(log_dir, count):
+    """Processus de travail : enregistre des erreurs, le résumé est écrit à la sortie (atexit)."""
+    handler = ErrorHandler(log_dir=log_dir)
+    for i in range(count):
+        handler.log_error(ValueError(f"erreur {i}"), capture_traceback=False)
+
+
+class TestErrorSummary(unittest.TestCase):
+    def test_summary_merges_counts_from_several_processes(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            context = multiprocessing.get_context("spawn")
+            workers = [context.Process(target=_log_errors_in_worker, args=(log_dir, 10)) for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+                self.assertEqual(worker.exitcode, 0)
+
+            handler = ErrorHandler(log_dir=log_dir)
+            handler.log_error(KeyError("parent"), capture_traceback=False)
+            handler._flush_summary()
+            handler._flush_log_buffer()
+
+            with open(handler.summary_file, "rb") as f:
+                summary = orjson.loads(f.read())
+            with open(handler.error_log_file, "rb") as f:
+                journal_lines = f.read().splitlines()
+
+            self.assertEqual(len(journal_lines), 41)
+            self.assertEqual(summary["total_errors"], 41)
+            self.assertEqual(summary["categories"]["other"], 41)
+            self.assertEqual(summary["most_common_errors"]["ValueError: erreur 0"], 4)
+            self.assertEqual(handler.get_error_summary()["total_errors"], 41)
+
+    def test_summary_includes_other_handlers_and_pending_counts(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            # Deux gestionnaires sur le même dossier, comme deux processus
+            first = ErrorHandler(log_dir=log_dir)
+            second = ErrorHandler(log_dir=log_dir)
+            for i in range(3):
+                first.log_error(ValueError(f"erreur {i}"), capture_traceback=False)
+            for i in range(2):
+                second.log_error(OSError("lecture impossible"), category="file_read", capture_traceback=False)
+            second._flush_summary()
+
+            # Compteurs en attente de first ajoutés, puis résumé relu avec ceux de second
+            summary = first.get_error_summary()
+            self.assertEqual(summary["total_errors"], 5)
+            self.assertEqual(summary["categories"]["other"], 3)
+            self.assertEqual(summary["categories"]["file_read"], 2)
+            self.assertEqual(second.get_error_summary(), summary)
+            first._flush_log_buffer()
+            second._flush_log_buffer()
+
+    def test_exit_flush_without_pending_writes_nothing(self):
+        log_dir = tempfile.mkdtemp()
+        handler = ErrorHandler(log_dir=log_dir)
+        handler.log_error(ValueError("erreur"), capture_traceback=False)
+        handler._flush_log_buffer()
+        handler._flush_summary()
+        for name in os.listdir(log_dir):
+            os.remove(os.path.join(log_dir, name))
+        os.rmdir(log_dir)
+
+        handler._flush_at_exit()
+        self.assertFalse(os.path.exists(log_dir))
+
+
+class TestHandleError(unittest.TestCase):
+    def setUp(self):
+        # Journal dans un dossier temporaire plutôt que dans logs/
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.log_dir.cleanup)
+        handler = ErrorHandler(log_dir=self.log_dir.name)
+        # Écritures en attente faites avant la suppression du dossier (et non à la sortie)
+        self.addCleanup(handler._flush_log_buffer)
+        self.addCleanup(handler._flush_summary)
+        patcher = mock.patch.object(error_handler_module, "error_handler", handler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = handler
+
+    def test_default_return_value(self):
+        @handle_error
+        def read_txt_file(file_path):
+            raise FileNotFoundError(file_path)
+
+        @handle_error
+        def compute(value):
+            raise ValueError(value)
+
+        # Lecteurs de fichiers : chaîne vide ; autres fonctions : None
+        self.assertEqual(read_txt_file("/dossier/absent.txt"), "")
+        self.assertIsNone(compute("x"))
+
+        errors = self.handler.get_recent_errors()
+        self.assertEqual(len(errors), 2)
+        by_type = {error["error_type"]: error for error in errors}
+        self.assertEqual(by_type["FileNotFoundError"]["file_path"], "/dossier/absent.txt")
+        self.assertEqual(by_type["FileNotFoundError"]["category"], "file_access")
+        self.assertIsNone(by_type["ValueError"]["file_path"])
+
+    def test_wraps_preserves_metadata_and_result(self):
+        @handle_error
+        def read_docx_file(file_path):
+            """Lit un document."""
+            return "contenu"
+
+        self.assertEqual(read_docx_file.__name__, "read_docx_file")
+        self.assertEqual(read_docx_file.__doc__, "Lit un document.")
+        self.assertEqual(read_docx_file("/a/b.docx"), "contenu")
+        self.assertEqual(self.handler.get_recent_errors(), [])
+
+
+class AccessDenied(Exception):
+    """Même nom que psutil.AccessDenied (non importé par le gestionnaire)."""
+
+
+class MissingDocument(FileNotFoundError):
+    pass
+
+
+class TestCategorizeError(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.log_dir.cleanup)
+        self.handler = ErrorHandler(log_dir=self.log_dir.name)
+
+    def test_categories(self):
+        cases = [
+            # Types reconnus directement, quel que soit le message
+            (FileNotFoundError("format invalide"), "file_access"),
+            (MissingDocument("permission denied"), "file_access"),
+            (NotADirectoryError("x"), "file_access"),
+            (PermissionError("not found"), "permissions"),
+            (AccessDenied("pid=42"), "permissions"),
+            (MemoryError(), "memory"),
+            (OverflowError("read"), "memory"),
+            # Un seul mot-clé
+            (ValueError("Connection reset"), "network"),
+            (ValueError("Fichier corrompu : format inconnu"), "file_format"),
+            (OSError("Lecture impossible"), "file_read"),
+            # Plusieurs mots-clés : la catégorie la plus prioritaire l'emporte
+            (RuntimeError("timeout while reading: invalid header"), "file_read"),
+            (RuntimeError("invalid format, network timeout"), "file_format"),
+            (OSError("cannot open: no such file"), "file_access"),
+            (OSError("open failed, access denied (no such file)"), "permissions"),
+            (ValueError("connexion réseau perdue, accès refusé"), "permissions"),
+            # Aucun mot-clé
+            (KeyError("colonne"), "other"),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=repr(error)):
+                self.assertEqual(self.handler.categorize_error(error), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
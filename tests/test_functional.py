@@ -5,12 +5,23 @@ import unittest
 from pathlib import Path
 import pandas as pd
 import tempfile
+import io
+import datetime
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
 
 # Ajouter le répertoire parent au chemin pour permettre l'importation
 parent_dir = str(Path(__file__).resolve().parent.parent)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
+from analyzer import core
 from analyzer.core import (
     detect_personal_data, 
     is_likely_organizational_name,
@@ -186,6 +197,271 @@ class TestFunctionalIntegration(unittest.TestCase):
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
 
+    def test_batch_detection_matches_single_detection(self):
+        """Vérifie que la détection par lots (nlp.pipe) donne les mêmes résultats que texte par texte."""
+        from analyzer.core import detect_personal_data_batch
+
+        texts = [
+            self.test_content_with_personal_data,
+            "ok",  # Trop court pour la NER
+            self.test_content_with_organization_context,
+            self.test_content_template,
+        ]
+        batch_results = detect_personal_data_batch([(text, "") for text in texts], batch_size=2)
+
+        self.assertEqual(len(batch_results), len(texts))
+        for text, batch_result in zip(texts, batch_results):
+            self.assertEqual(batch_result, detect_personal_data(text))
+
+
+@unittest.skipIf(openpyxl is None, "openpyxl non disponible")
+class TestExcelExtraction(unittest.TestCase):
+    """Extraction .xlsx sans DataFrame : même texte que l'ancienne lecture par pandas."""
+    
+    def setUp(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for row in (
+            ["Nom", None, "Nom", "Date", "Nom"],
+            ["Jean", 1.0, "Paul", datetime.date(2024, 1, 5), "x"],
+            [None] * 5,
+            ["Marie", 2.5, "Luc", datetime.datetime(2024, 2, 1, 9, 30), None],
+            [None] * 5,
+            [None] * 5,
+        ):
+            sheet.append(row)
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        self.xlsx_bytes = buffer.getvalue()
+    
+    def test_extract_excel_text_edge_cases(self):
+        expected = "\n".join([
+            "Nom: Jean  Marie",
+            "Unnamed: 1: 1  2.5",
+            "Nom.1: Paul  Luc",
+            "Date: 2024-01-05 00:00:00  2024-02-01 09:30:00",
+            "Nom.2: x  ",
+        ])
+        engines = ["openpyxl"] + (["calamine"] if core.python_calamine is not None else [])
+        for engine in engines:
+            with self.subTest(engine=engine), mock.patch.object(core, "XLSX_ENGINE", engine):
+                # Ligne vide conservée entre deux lignes remplies, supprimée en fin de feuille
+                self.assertEqual(core.extract_excel_text(self.xlsx_bytes, ".xlsx", "test.xlsx"), expected)
+                rows = list(core.iter_xlsx_rows(io.BytesIO(self.xlsx_bytes)))
+                self.assertEqual(rows[1][0], "Jean")
+    
+    def test_cell_text_and_column_labels(self):
+        cases = [
+            (None, ""),
+            (3.0, "3"),
+            (3.5, "3.5"),
+            (7, "7"),
+            ("0612", "0612"),
+            (datetime.date(2024, 1, 5), "2024-01-05 00:00:00"),
+            (datetime.datetime(2024, 1, 5, 8, 0), "2024-01-05 08:00:00"),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(core.xlsx_cell_text(value), expected)
+        
+        labels = core.xlsx_column_labels(("A", "A.1", "A", None), 5)
+        self.assertEqual(labels, ["A", "A.1", "A.2", "Unnamed: 3", "Unnamed: 4"])
+        # Même résultat que les noms de colonnes dédoublonnés par pandas
+        self.assertEqual(labels, pd.read_csv(io.StringIO("A,A.1,A,,\n1,2,3,4,5\n")).columns.tolist())
+
+
+@unittest.skipIf(core.pa is None, "pyarrow non disponible")
+class TestCsvExtraction(unittest.TestCase):
+    """Lecture pyarrow des CSV (seuil de taille abaissé pour des fichiers de test)."""
+    
+    def _write_csv(self, content):
+        tmp = tempfile.NamedTemporaryFile(suffix=".csv", delete=False, mode="w", encoding="utf-8", newline="")
+        with tmp:
+            tmp.write(content)
+        self.addCleanup(os.unlink, tmp.name)
+        return tmp.name
+    
+    def test_semicolon_csv_keeps_leading_zeros(self):
+        file_path = self._write_csv(
+            "nom;telephone;email\r\n"
+            "Jean Dupont;0612345678;jean@example.com\r\n"
+            "Marie Martin;0102030405;\r\n"
+        )
+        expected = "\n".join([
+            "nom: Jean Dupont Marie Martin",
+            "telephone: 0612345678 0102030405",
+            "email: jean@example.com ",
+        ])
+        with mock.patch.object(core, "CSV_ARROW_MIN_SIZE", 0):
+            self.assertEqual(core.extract_csv_text(file_path), expected)
+            self.assertEqual(core.read_csv_file(file_path), expected)
+        # Au-dessous du seuil : lecture texte brute
+        self.assertEqual(core.read_csv_file(file_path), core.read_txt_file(file_path))
+    
+    def test_ragged_rows_fall_back_to_text(self):
+        content = "nom,telephone\nJean Dupont,0612345678,en trop\nMarie Martin\n"
+        file_path = self._write_csv(content)
+        with mock.patch.object(core, "CSV_ARROW_MIN_SIZE", 0):
+            with self.assertRaises(Exception):
+                core.extract_csv_text(file_path)
+            self.assertEqual(core.read_csv_file(file_path), content)
+
+
+class TestAnalyzeBytes(unittest.TestCase):
+    """analyze_bytes (fichiers téléchargés) doit donner le même résultat que l'analyse sur disque."""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+    
+    def _assert_same_as_file(self, file_name, content):
+        file_path = os.path.join(self.tmp_dir.name, file_name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        result = core.analyze_bytes(file_path, content)
+        self.assertIsNotNone(result)
+        self.assertEqual(result, core.analyze_file(file_path))
+        self.assertNotIn("\r", result["text_snippet"])
+        return result
+    
+    def test_text_and_csv_line_endings(self):
+        text = "Contact : jean.dupont@example.com\r\nTéléphone : 06 12 34 56 78\r\n"
+        result = self._assert_same_as_file("note.txt", text.encode("utf-8"))
+        self.assertEqual(result["emails_found"], "jean.dupont@example.com")
+        self._assert_same_as_file("contacts.csv", "nom;email\r\nJean;jean@example.com\r\n".encode("utf-8"))
+        self._assert_same_as_file("ancien.txt", "Adresse : 12 rue de la Paix\r75002 Paris\r".encode("cp1252"))
+    
+    @unittest.skipIf(openpyxl is None, "openpyxl non disponible")
+    def test_excel(self):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["Nom", "Email"])
+        workbook.active.append(["Jean", "jean@example.com"])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        result = self._assert_same_as_file("contacts.xlsx", buffer.getvalue())
+        self.assertEqual(result["file_type"], "excel")
+
+
+def _make_pdf(text):
+    """PDF minimal d'une page contenant `text` (police Helvetica standard)."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        pdf += b"%010d 00000 n \n" % offset
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+@unittest.skipIf(core.pdfium is None, "pypdfium2 non disponible")
+class TestPdfExtraction(unittest.TestCase):
+    """PDFium n'est pas thread-safe : ses appels sont sérialisés par core._pdfium_lock."""
+    
+    def test_pdfium_calls_hold_the_lock(self):
+        real_document = core.pdfium.PdfDocument
+        # État du verrou relevé à l'ouverture (une assertion levée ici serait absorbée
+        # par le repli sur PyPDF2)
+        lock_states = []
+        
+        def locked_document(*args, **kwargs):
+            lock_states.append(core._pdfium_lock.locked())
+            return real_document(*args, **kwargs)
+        
+        with mock.patch.object(core.pdfium, "PdfDocument", side_effect=locked_document):
+            text = core.extract_pdf_text(_make_pdf("Contact jean@example.com"), "test.pdf")
+        self.assertEqual(text, "Contact jean@example.com")
+        self.assertEqual(lock_states, [True])
+    
+    def test_concurrent_extraction(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sources = []
+            for i in range(32):
+                content = _make_pdf(f"Document {i}")
+                if i % 2:
+                    sources.append(content)
+                else:
+                    file_path = os.path.join(tmp_dir, f"document_{i}.pdf")
+                    with open(file_path, "wb") as f:
+                        f.write(content)
+                    sources.append(file_path)
+            # Même usage que les threads de scan_files et des tâches en arrière-plan
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                texts = list(executor.map(core.extract_pdf_text, sources, ["test.pdf"] * len(sources)))
+        self.assertEqual(texts, [f"Document {i}" for i in range(32)])
+
+
+class TestBufferPool(unittest.TestCase):
+    """Pool des tampons de lecture PDF : taille bornée, tampons trop petits conservés."""
+    
+    def setUp(self):
+        patcher = mock.patch.object(core, "_buffer_pool", queue.LifoQueue(maxsize=core._BUFFER_POOL_SIZE))
+        self.pool = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_large_buffers_are_not_pooled(self):
+        size = core._MAX_POOLED_BUFFER_SIZE + 1
+        buffer = core.acquire_buffer(size)
+        self.assertEqual(len(buffer), size)
+        core.release_buffer(buffer)
+        self.assertTrue(self.pool.empty())
+    
+    def test_undersized_buffer_is_kept(self):
+        small = core.acquire_buffer(1000)
+        self.assertEqual(len(small), core._MIN_BUFFER_SIZE)
+        core.release_buffer(small)
+        
+        larger = core.acquire_buffer(100 * 1024)
+        self.assertEqual(len(larger), 128 * 1024)
+        self.assertEqual(self.pool.qsize(), 1)
+        core.release_buffer(larger)
+        # Le plus récent est réutilisé en premier
+        self.assertIs(core.acquire_buffer(1000), larger)
+        self.assertIs(core.acquire_buffer(1000), small)
+    
+    def test_pypdf2_fallback_reads_through_pool(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "document.pdf")
+            with open(file_path, "wb") as f:
+                f.write(_make_pdf("Contact jean@example.com"))
+            with mock.patch.object(core, "pdfium", None):
+                text = core.extract_pdf_text(file_path, file_path)
+        self.assertIn("jean@example.com", text)
+        self.assertEqual(self.pool.qsize(), 1)
+
+
+class TestNamePrefilter(unittest.TestCase):
+    """Pré-filtre NER : seuls les textes sans majuscule ni titre sont ignorés."""
+    
+    def test_may_contain_person_name(self):
+        cases = [
+            ("Bonjour, je suis Jean Dupont", True),
+            ("compte rendu rédigé par ÉLODIE", True),
+            ("courrier de œuvre Œuvre", True),
+            ("contacter mme dupont", True),
+            ("письмо от Иван", True),
+            ("id;montant\n1;12,50\n2;8,00", False),
+            ("192.168.1.1\n10.0.0.2", False),
+            ("2026-10-16 info tâche terminée, durée=0.2s", False),
+            ("письмо от ивана", False),
+            ("", False),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(core.may_contain_person_name(text), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,204 @@
+# tests/test_storage.py
+import os
+import sys
+import unittest
+import tempfile
+import multiprocessing
+from pathlib import Path
+from unittest import mock
+
+import orjson
+import pandas as pd
+
+# Ajouter le répertoire parent au chemin pour permettre l'importation
+parent_dir = str(Path(__file__).resolve().parent.parent)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from analyzer import storage as storage_module
+from analyzer.storage import AnalysisStorage, read_analysis_file, write_analysis_file
+
+
+def _results_df(sensitive=True):
+    return pd.DataFrame({
+        "file_path": ["/docs/a.txt", "/docs/b.txt"],
+        "file_type": [".txt", ".txt"],
+        "emails_found": ["a@b.fr" if sensitive else "", ""],
+    })
+
+
+def _save_and_delete_in_worker(storage_dir, worker, count):
+    """Processus de travail : ajoute des analyses et en supprime la plupart (déclenche le compactage)."""
+    storage = AnalysisStorage(storage_dir)
+    kept = []
+    for i in range(count):
+        analysis_id = storage.save_analysis(_results_df(), f"processus {worker} - {i}")
+        if i % 4 == 0:
+            kept.append(analysis_id)
+        else:
+            storage.delete_analysis(analysis_id)
+    return kept
+
+
+class TestMetadataLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.storage_dir = self.tmp.name
+        self.log_path = os.path.join(self.storage_dir, AnalysisStorage.METADATA_LOG)
+        self.addCleanup(AnalysisStorage._metadata_cache.clear)
+
+    def _reopen(self):
+        """Nouvelle instance sans le cache partagé : force la relecture du journal."""
+        AnalysisStorage._metadata_cache.clear()
+        return AnalysisStorage(self.storage_dir)
+
+    def _log_records(self):
+        with open(self.log_path, "rb") as f:
+            return [orjson.loads(line) for line in f.read().splitlines()]
+
+    def test_save_delete_and_tombstone_replay(self):
+        storage = AnalysisStorage(self.storage_dir)
+        first = storage.save_analysis(_results_df(), "première")
+        second = storage.save_analysis(_results_df(sensitive=False), "seconde")
+        self.assertTrue(storage.delete_analysis(first))
+        self.assertFalse(storage.delete_analysis(first))
+
+        self.assertEqual([record["op"] for record in self._log_records()], ["add", "add", "del"])
+
+        # Relecture : la suppression (« del ») masque l'ajout correspondant
+        reopened = self._reopen()
+        metadata = reopened.get_all_analyses_metadata()
+        self.assertEqual([entry["id"] for entry in metadata], [second])
+        self.assertFalse(metadata[0]["has_sensitive_data"])
+        self.assertEqual(reopened.get_analysis(first), (None, None))
+        df, entry = reopened.get_analysis(second)
+        self.assertEqual(entry["name"], "seconde")
+        self.assertEqual(len(df), 2)
+
+    def test_compaction_after_many_records(self):
+        storage = AnalysisStorage(self.storage_dir)
+        ids = [storage.save_analysis(_results_df(), f"analyse {i}") for i in range(20)]
+        for analysis_id in ids[:15]:
+            storage.delete_analysis(analysis_id)
+        # 35 lignes pour 5 analyses : au-delà de COMPACT_MIN_RECORDS et de 2 × 5
+        self.assertEqual(len(self._log_records()), 35)
+
+        reopened = self._reopen()
+        metadata = reopened.get_all_analyses_metadata()
+        self.assertEqual([entry["id"] for entry in metadata], ids[15:][::-1])
+
+        records = self._log_records()
+        self.assertEqual(len(records), 5)
+        self.assertTrue(all(record["op"] == "add" for record in records))
+        self.assertEqual([entry["id"] for entry in self._reopen().get_all_analyses_metadata()], ids[15:][::-1])
+
+    def test_migration_from_legacy_metadata_json(self):
+        legacy = []
+        for i in range(2):
+            pkl_path = os.path.join(self.storage_dir, f"analysis_legacy{i}.pkl")
+            _results_df().to_pickle(pkl_path)
+            legacy.append({
+                "id": f"legacy{i}",
+                "name": f"ancienne {i}",
+                "date": f"2024-01-0{i + 1} 10:00:00",
+                "file_count": 2,
+                "has_sensitive_data": True,
+                "source_path": "",
+                "description": "",
+                "file_path": pkl_path,
+            })
+        # Ancien format : liste de la plus récente à la plus ancienne
+        legacy.reverse()
+        with open(os.path.join(self.storage_dir, AnalysisStorage.LEGACY_METADATA_FILE), "wb") as f:
+            f.write(orjson.dumps(legacy))
+
+        storage = self._reopen()
+        self.assertTrue(os.path.exists(self.log_path))
+        self.assertEqual(storage.get_all_analyses_metadata(), legacy)
+
+        df, entry = storage.get_analysis("legacy0")
+        self.assertEqual(entry["name"], "ancienne 0")
+        pd.testing.assert_frame_equal(df, _results_df())
+
+        combined, entries = storage.concatenate_analyses(["legacy1", "legacy0"])
+        self.assertEqual(len(combined), 4)
+        self.assertEqual([e["id"] for e in entries], ["legacy1", "legacy0"])
+
+    def test_truncated_last_line_is_skipped(self):
+        storage = AnalysisStorage(self.storage_dir)
+        kept = storage.save_analysis(_results_df(), "conservée")
+        # Écriture interrompue : dernière ligne incomplète, sans fin de ligne
+        with open(self.log_path, "ab") as f:
+            f.write(b'{"op": "add", "id": "tronq')
+
+        storage = self._reopen()
+        self.assertEqual([entry["id"] for entry in storage.get_all_analyses_metadata()], [kept])
+
+        # L'ajout suivant repart sur une nouvelle ligne et reste lisible
+        added = storage.save_analysis(_results_df(), "après")
+        self.assertEqual(
+            [entry["id"] for entry in self._reopen().get_all_analyses_metadata()],
+            [added, kept]
+        )
+
+    def test_concurrent_appends_and_compaction(self):
+        AnalysisStorage(self.storage_dir)
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            kept = pool.starmap(_save_and_delete_in_worker,
+                                [(self.storage_dir, worker, 40) for worker in range(4)])
+
+        # Aucune opération perdue, que le journal ait été compacté ou non entre-temps
+        expected = {analysis_id for ids in kept for analysis_id in ids}
+        self.assertEqual(len(expected), 40)
+        metadata = self._reopen().get_all_analyses_metadata()
+        self.assertEqual({entry["id"] for entry in metadata}, expected)
+        self.assertEqual(len(metadata), len(expected))
+
+
+class TestPickleRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.base_path = os.path.join(self.tmp.name, "analysis_test")
+        rows = 12
+        self.df = pd.DataFrame({
+            # Chaînes répétitives : encodées en catégories dans le pickle
+            "file_type": [".txt", ".pdf", ".docx"] * (rows // 3),
+            "file_path": [f"/docs/fichier_{i}.txt" for i in range(rows)],
+            "mixed": [1, "1", True, 2.5, None, "a"] * (rows // 6),
+            "empty": pd.Series([None] * rows, dtype=object),
+            "emails_risk": [i / 4 for i in range(rows)],
+        })
+        self.df.attrs["source"] = "test"
+
+    def _round_trip(self, df):
+        expected = df.copy()
+        file_path = write_analysis_file(df, self.base_path)
+        self.assertTrue(file_path.endswith(".pkl"))
+        result = read_analysis_file(file_path)
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(result.attrs, expected.attrs)
+        # Le DataFrame d'origine n'est pas modifié par l'encodage
+        pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(df.attrs, expected.attrs)
+        return file_path
+
+    def test_forced_pickle_round_trip(self):
+        with mock.patch.object(storage_module, "PARQUET_AVAILABLE", False):
+            file_path = self._round_trip(self.df)
+        self.assertEqual(
+            read_analysis_file(file_path, columns=["mixed", "absente"]).columns.tolist(),
+            ["mixed"]
+        )
+
+    def test_mixed_column_falls_back_to_pickle(self):
+        if not storage_module.PARQUET_AVAILABLE:
+            self.skipTest("pyarrow non disponible")
+        self._round_trip(self.df)
+        self.assertFalse(os.path.exists(self.base_path + ".parquet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,8 +12,11 @@ if parent_dir not in sys.path:
 from analyzer.validators import (
     validate_email, validate_phone, validate_date, 
     validate_secu, validate_siret, validate_person_name,
-    validate_postal_address, validate_ip_address
+    validate_postal_address, validate_ip_address,
+    validate_email_series, validate_phone_series,
+    validate_secu_series, validate_siret_series
 )
+import pandas as pd
 
 class TestValidators(unittest.TestCase):
     def test_validate_email(self):
@@ -150,6 +153,18 @@ class TestValidators(unittest.TestCase):
         valid, confidence = validate_person_name("Pierre Durand", prof_context)
         # Doit être valide mais avec un score de confiance possiblement réduit
         self.assertTrue(valid)
+    
+    def test_series_validators_match_scalar(self):
+        # Les variantes par colonne doivent donner le même résultat que les validateurs unitaires
+        cases = [
+            (validate_email_series, validate_email, ["test@example.com", "test@ogfa.com", "@example.com", ""]),
+            (validate_phone_series, validate_phone, ["0612345678", "06 12 34 56 78", "+330612345678", "0512345678", "abc"]),
+            (validate_secu_series, validate_secu, ["196123456789012", "1540239123456", "496123456789012", "12345"]),
+            (validate_siret_series, validate_siret, ["73282932000074", "73282932000075", "1234567890"]),
+        ]
+        for series_validator, validator, values in cases:
+            result = series_validator(pd.Series(values + [None]))
+            self.assertEqual(result.tolist(), [validator(value) for value in values] + [False])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file